@@ -9,11 +9,17 @@ Claude A component - coordinates with Claude B's Security Auditor
 import os
 import ast
 import json
+import functools
 import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
+@functools.lru_cache(maxsize=128)
+def _parse_source(code_content: str) -> ast.AST:
+    """Parse Python source, reusing the tree for identical source (analyzers only read it)"""
+    return ast.parse(code_content)
+
 class ArchitectureReviewer:
     """Architecture and design pattern analysis component"""
     
@@ -31,7 +37,7 @@ class ArchitectureReviewer:
     def review_code(self, code_content: str, file_path: str = "unknown") -> Dict[str, Any]:
         """Main entry point for architecture review"""
         try:
-            tree = ast.parse(code_content)
+            tree = _parse_source(code_content)
             
             analysis_results = {}
             for pattern_name, analyzer in self.analysis_patterns.items():
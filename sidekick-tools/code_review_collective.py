@@ -11,7 +11,8 @@ import json
 import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
 
 # Import our distributed AI components
 try:
@@ -31,6 +32,21 @@ class CodeReviewCollective:
         
     def review_file(self, file_path: str, options: Dict[str, bool] = None) -> Dict[str, Any]:
         """Perform comprehensive code review using both AI components"""
+        # Read the code file
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                code_content = f.read()
+        except Exception as e:
+            return {
+                "error": f"Failed to read file {file_path}: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        return self.review_source(code_content, file_path, options)
+    
+    def review_source(self, code_content: str, file_path: str = "unknown",
+                      options: Dict[str, bool] = None) -> Dict[str, Any]:
+        """Review in-memory source code; file_path only labels the report"""
         if options is None:
             options = {"security": True, "architecture": True}
         
@@ -43,45 +59,62 @@ class CodeReviewCollective:
             "summary": ""
         }
         
-        # Read the code file
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code_content = f.read()
-        except Exception as e:
-            return {
-                "error": f"Failed to read file {file_path}: {str(e)}",
-                "timestamp": datetime.now().isoformat()
-            }
-        
         print(f"🔍 Analyzing {file_path}...")
         
-        # Run Security Analysis (Claude B's component)
+        # Security Analysis (Claude B's component) and Architecture Analysis (Claude A's
+        # component) are independent, so they run side by side when both are requested
+        analyzers = {}
         if options.get("security", True):
             print("🔒 Running security analysis...")
-            try:
-                security_results = self.security_auditor.analyze_code(code_content, file_path)
+            analyzers["security"] = self.security_auditor.analyze_code
+        if options.get("architecture", True):
+            print("🏗️  Running architecture analysis...")
+            analyzers["architecture"] = self.architecture_reviewer.review_code
+        
+        outcomes = self._run_analyses(analyzers, code_content, file_path)
+        
+        if "security" in outcomes:
+            security_results = outcomes["security"]
+            if isinstance(security_results, Exception):
+                results["reviews"]["security"] = {"error": str(security_results)}
+                print(f"   Security analysis failed: {security_results}")
+            else:
                 results["reviews"]["security"] = security_results
                 print(f"   Security analysis complete - Risk: {security_results.get('summary', {}).get('risk_score', 'N/A')}")
-            except Exception as e:
-                results["reviews"]["security"] = {"error": str(e)}
-                print(f"   Security analysis failed: {e}")
         
-        # Run Architecture Analysis (Claude A's component)  
-        if options.get("architecture", True):
-            print("🏗️  Running architecture analysis...")
-            try:
-                architecture_results = self.architecture_reviewer.review_code(code_content, file_path)
+        if "architecture" in outcomes:
+            architecture_results = outcomes["architecture"]
+            if isinstance(architecture_results, Exception):
+                results["reviews"]["architecture"] = {"error": str(architecture_results)}
+                print(f"   Architecture analysis failed: {architecture_results}")
+            else:
                 results["reviews"]["architecture"] = architecture_results
                 print(f"   Architecture analysis complete - Score: {architecture_results.get('overall_score', 'N/A')}/10")
-            except Exception as e:
-                results["reviews"]["architecture"] = {"error": str(e)}
-                print(f"   Architecture analysis failed: {e}")
         
         # Generate combined analysis
         results.update(self._combine_analyses(results["reviews"]))
         
         return results
     
+    def _run_analyses(self, analyzers: Dict[str, Callable[[str, str], Dict[str, Any]]],
+                      code_content: str, file_path: str) -> Dict[str, Any]:
+        """Run analyzers (concurrently if more than one), mapping name to result or raised exception"""
+        if len(analyzers) < 2:
+            outcomes = {}
+            for name, analyzer in analyzers.items():
+                try:
+                    outcomes[name] = analyzer(code_content, file_path)
+                except Exception as e:
+                    outcomes[name] = e
+            return outcomes
+        
+        with ThreadPoolExecutor(max_workers=len(analyzers)) as executor:
+            futures = {
+                name: executor.submit(analyzer, code_content, file_path)
+                for name, analyzer in analyzers.items()
+            }
+        return {name: future.exception() or future.result() for name, future in futures.items()}
+    
     def _combine_analyses(self, reviews: Dict[str, Any]) -> Dict[str, Any]:
         """Combine security and architecture analyses into unified report"""
         combined_score = 0
@@ -166,11 +199,15 @@ class CodeReviewCollective:
         
         return summary
     
-    def export_report(self, results: Dict[str, Any], output_path: str) -> bool:
-        """Export review results to JSON file"""
+    def export_report(self, results: Dict[str, Any], output_path: str, compact: bool = False) -> bool:
+        """Export review results to JSON file, streamed straight to the file handle"""
         try:
             with open(output_path, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+                if compact:
+                    # No indentation lets json use its C encoder and writes fewer bytes
+                    json.dump(results, f, separators=(',', ':'), default=str)
+                else:
+                    json.dump(results, f, indent=2, default=str)
             return True
         except Exception as e:
             print(f"Failed to export report: {e}")
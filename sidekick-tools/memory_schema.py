@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+SIDEKICK Memory Schema
+Derived columns, indexes and full-text index over the shared memory table
+Applied by running this module against a network database; the tools only detect it
+
+Usage:
+  python memory_schema.py [DB_PATH]
+"""
+
+import sys
+import sqlite3
+from contextlib import closing
+from typing import Dict, Set
+
+DEFAULT_DB_PATH = "/Users/mars/Dev/sidekick-boot-loader/db/claude-sonnet-4-session-20250829.db"
+
+# Payload fields extracted by SQLite's JSON1 in C; non-JSON payloads yield NULL.
+# {p} is the payload expression (payload, new.payload, ...)
+CONTENT_SQL = "CASE WHEN json_valid({p}) THEN json_extract({p}, '$.content') END"
+TYPE_SQL = "CASE WHEN json_valid({p}) THEN COALESCE(json_extract({p}, '$.type'), 'unknown') END"
+
+# ...exposed as virtual generated columns, so readers select them like plain fields
+GENERATED_COLUMNS = {"content": CONTENT_SQL.format(p="payload"), "mem_type": TYPE_SQL.format(p="payload")}
+
+# Recency windows, per-actor timelines, thread lookups and per-type trends
+MEMORY_INDEX_SQL = """
+    DROP INDEX IF EXISTS idx_memory_type;
+    CREATE INDEX IF NOT EXISTS idx_memory_created_at ON memory(created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_memory_actor_created ON memory(actor_uuid, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_memory_parent ON memory(parent_uuid) WHERE parent_uuid IS NOT NULL;
+    CREATE INDEX IF NOT EXISTS idx_memory_type_created ON memory(mem_type, created_at);
+"""
+
+# Databases whose memory table has a plain type column (set by the Security
+# Auditor's writes) also get it indexed, for the truth cascade's storage probe
+TYPE_COLUMN_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_memory_type_column_created ON memory(type, created_at DESC)"
+
+# Full-text index over memory content. Its rowids are the memory rowids, so the
+# triggers maintain it with rowid lookups.
+MEMORY_FTS_MODULE_SQL = (
+    "fts5(memory_uuid UNINDEXED, content, memory_type, actor_uuid UNINDEXED, created_at UNINDEXED, "
+    "tokenize='porter unicode61')"
+)
+_FTS_COLUMNS = "rowid, memory_uuid, content, memory_type, actor_uuid, created_at"
+_FTS_VALUES = (
+    f"new.rowid, new.memory_uuid, {CONTENT_SQL.format(p='new.payload')}, "
+    f"{TYPE_SQL.format(p='new.payload')}, new.actor_uuid, new.created_at"
+)
+
+# Written the way sqlite_master stores them, so migrate() can tell whether a
+# database already carries this version of the triggers
+MEMORY_FTS_TRIGGERS = {
+    "memory_fts_insert": f"""CREATE TRIGGER memory_fts_insert AFTER INSERT ON memory BEGIN
+        INSERT INTO memory_fts ({_FTS_COLUMNS}) VALUES ({_FTS_VALUES});
+    END""",
+    "memory_fts_delete": """CREATE TRIGGER memory_fts_delete AFTER DELETE ON memory BEGIN
+        DELETE FROM memory_fts WHERE rowid = old.rowid;
+    END""",
+    "memory_fts_update": f"""CREATE TRIGGER memory_fts_update AFTER UPDATE ON memory BEGIN
+        DELETE FROM memory_fts WHERE rowid = old.rowid;
+        INSERT INTO memory_fts ({_FTS_COLUMNS}) VALUES ({_FTS_VALUES});
+    END""",
+}
+
+def memory_columns(conn: sqlite3.Connection) -> Set[str]:
+    """Column names of memory, generated columns included"""
+    return {row[1] for row in conn.execute("PRAGMA table_xinfo(memory)")}
+
+def payload_columns(conn: sqlite3.Connection) -> Dict[str, str]:
+    """SQL for content/mem_type: the generated columns once migrated, else the payload expressions"""
+    existing = memory_columns(conn)
+    return {name: name if name in existing else expression for name, expression in GENERATED_COLUMNS.items()}
+
+def has_memory_fts(conn: sqlite3.Connection, schema: str = "main") -> bool:
+    """Whether `schema` holds a memory_fts index"""
+    return conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'memory_fts'"
+    ).fetchone() is not None
+
+def create_memory_fts(conn: sqlite3.Connection, schema: str = "main"):
+    """Create memory_fts in `schema` (main, temp or an attached database) and index every memory"""
+    conn.execute(f"CREATE VIRTUAL TABLE {schema}.memory_fts USING {MEMORY_FTS_MODULE_SQL}")
+    conn.execute(f"""
+        INSERT INTO {schema}.memory_fts ({_FTS_COLUMNS})
+        SELECT rowid, memory_uuid, {CONTENT_SQL.format(p="payload")}, {TYPE_SQL.format(p="payload")},
+               actor_uuid, created_at
+        FROM main.memory
+    """)
+
+def _memory_fts_current(conn: sqlite3.Connection) -> bool:
+    """Whether main.memory_fts and its triggers match the definitions above"""
+    stored = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE name = 'memory_fts' OR name LIKE 'memory_fts_%'"
+    ).fetchall())
+    return (
+        stored.get("memory_fts") == f"CREATE VIRTUAL TABLE memory_fts USING {MEMORY_FTS_MODULE_SQL}"
+        and all(stored.get(name) == sql for name, sql in MEMORY_FTS_TRIGGERS.items())
+    )
+
+def migrate(conn: sqlite3.Connection):
+    """Bring memory's generated columns, indexes and full-text index up to date (idempotent)
+
+    `conn` must be in autocommit mode (isolation_level=None).
+    """
+    # Persistent: readers stop blocking the sidekicks' writes
+    conn.execute("PRAGMA journal_mode = WAL")
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        existing = memory_columns(conn)
+        for name, expression in GENERATED_COLUMNS.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE memory ADD COLUMN {name} TEXT GENERATED ALWAYS AS ({expression}) VIRTUAL")
+        for statement in MEMORY_INDEX_SQL.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        if "type" in existing:
+            conn.execute(TYPE_COLUMN_INDEX_SQL)
+
+        # An index built by an older layout is dropped and rebuilt from scratch
+        if not _memory_fts_current(conn):
+            for name in MEMORY_FTS_TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            conn.execute("DROP TABLE IF EXISTS memory_fts")
+            create_memory_fts(conn)
+            for sql in MEMORY_FTS_TRIGGERS.values():
+                conn.execute(sql)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    conn.execute("ANALYZE memory")
+
+def main():
+    """Apply the memory schema to the network database"""
+    db_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DB_PATH
+
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as conn:
+        migrate(conn)
+
+    print(f"✅ Memory schema up to date: {db_path}")
+
+if __name__ == "__main__":
+    main()
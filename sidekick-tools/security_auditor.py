@@ -20,8 +20,78 @@ import ast
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple, Union
+from dataclasses import dataclass, asdict, replace
+
+from source_memo import memoize_by_source
+
+def _compile_patterns(patterns: List[str]) -> tuple:
+    """Compile a list of case-insensitive detection patterns"""
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+# Security pattern definitions, compiled once at import rather than on every scan
+SQL_PATTERNS = _compile_patterns([
+    r'\.execute\s*\(\s*["\'].*?%s.*?["\']',  # String formatting in SQL
+    r'\.execute\s*\(\s*f["\'].*?\{.*?\}.*?["\']',  # F-string in SQL
+    r'f["\'].*?SELECT.*?\{.*?\}.*?["\']',  # F-string SELECT
+    r'f["\'].*?INSERT.*?\{.*?\}.*?["\']',  # F-string INSERT  
+    r'f["\'].*?UPDATE.*?\{.*?\}.*?["\']',  # F-string UPDATE
+    r'f["\'].*?DELETE.*?\{.*?\}.*?["\']',  # F-string DELETE
+    r'SELECT.*?\+.*?["\']',  # String concatenation in SELECT
+    r'INSERT.*?\+.*?["\']',  # String concatenation in INSERT
+    r'UPDATE.*?\+.*?["\']',  # String concatenation in UPDATE
+    r'DELETE.*?\+.*?["\']',  # String concatenation in DELETE
+])
+
+XSS_PATTERNS = _compile_patterns([
+    r'innerHTML\s*=.*?[+].*?["\']',  # innerHTML with concatenation
+    r'document\.write\s*\(.*?[+].*?\)',  # document.write with concat
+    r'\.html\s*\(.*?[+].*?\)',  # jQuery .html() with concat
+    r'eval\s*\(.*?[+].*?\)',  # eval with user input
+    r'dangerouslySetInnerHTML',  # React dangerous HTML
+])
+
+SECRET_PATTERNS = _compile_patterns([
+    r'["\'](?:api_key|apikey|api-key)\s*[=:]\s*["\'][^"\']{8,}["\']',
+    r'(?:API_KEY|api_key|apikey|api-key)\s*=\s*["\'][^"\']{8,}["\']',  # Variable assignment
+    r'["\'](?:password|pwd|pass)\s*[=:]\s*["\'][^"\']{4,}["\']',
+    r'(?:PASSWORD|password|pwd|pass)\s*=\s*["\'][^"\']{4,}["\']',  # Variable assignment
+    r'["\'](?:token|access_token|auth_token)\s*[=:]\s*["\'][^"\']{10,}["\']',
+    r'["\'](?:secret|private_key|priv_key)\s*[=:]\s*["\'][^"\']{8,}["\']',
+    r'[A-Za-z0-9]{32,}',  # Long hex strings (potential keys)
+    r'sk_[a-zA-Z0-9]{24,}',  # Stripe secret keys
+    r'ghp_[a-zA-Z0-9]{36}',  # GitHub personal access tokens
+])
+
+AUTH_PATTERNS = _compile_patterns([
+    r'if.*?password\s*==\s*["\'].*?["\']',  # Hardcoded password check
+    r'admin.*?==.*?True',  # Simple admin checks
+    r'user\.is_admin\s*=\s*True',  # Direct admin assignment
+    r'session\[["\'].*?["\']\]\s*=.*?without.*?validation',  # Session without validation
+])
+
+INPUT_VALIDATION_PATTERNS = _compile_patterns([
+    r'request\.(GET|POST|args|form)\[.*?\].*?without.*?validation',
+    r'input\s*\(.*?\).*?without.*?sanitization',
+    r'os\.system\s*\(.*?user.*?input',  # OS command with user input
+    r'subprocess\..*?\(.*?user.*?input',  # Subprocess with user input
+    r'open\s*\(.*?user.*?input',  # File operations with user input
+])
+
+# Dangerous functions fed with user input
+DANGEROUS_CALL_PATTERNS = _compile_patterns([
+    r'os\.system\s*\([^)]*(?:input|request|argv)',
+    r'subprocess\.(?:call|run|Popen)\s*\([^)]*(?:input|request|argv)',
+    r'eval\s*\([^)]*(?:input|request|argv)',
+    r'exec\s*\([^)]*(?:input|request|argv)',
+    r'open\s*\([^)]*(?:input|request|argv)',
+])
+
+PATH_TRAVERSAL_PATTERNS = _compile_patterns([
+    r'open\s*\([^)]*\.\./.*["\']',
+    r'file_path.*?=.*?request',
+    r'os\.path\.join.*?request',
+])
 
 @dataclass
 class SecurityFinding:
@@ -42,57 +112,25 @@ class SecurityAuditor:
         self.db_path = db_path
         self.findings: List[SecurityFinding] = []
         
-        # Security pattern definitions
-        self.sql_patterns = [
-            r'\.execute\s*\(\s*["\'].*?%s.*?["\']',  # String formatting in SQL
-            r'\.execute\s*\(\s*f["\'].*?\{.*?\}.*?["\']',  # F-string in SQL
-            r'f["\'].*?SELECT.*?\{.*?\}.*?["\']',  # F-string SELECT
-            r'f["\'].*?INSERT.*?\{.*?\}.*?["\']',  # F-string INSERT  
-            r'f["\'].*?UPDATE.*?\{.*?\}.*?["\']',  # F-string UPDATE
-            r'f["\'].*?DELETE.*?\{.*?\}.*?["\']',  # F-string DELETE
-            r'SELECT.*?\+.*?["\']',  # String concatenation in SELECT
-            r'INSERT.*?\+.*?["\']',  # String concatenation in INSERT
-            r'UPDATE.*?\+.*?["\']',  # String concatenation in UPDATE
-            r'DELETE.*?\+.*?["\']',  # String concatenation in DELETE
-        ]
-        
-        self.xss_patterns = [
-            r'innerHTML\s*=.*?[+].*?["\']',  # innerHTML with concatenation
-            r'document\.write\s*\(.*?[+].*?\)',  # document.write with concat
-            r'\.html\s*\(.*?[+].*?\)',  # jQuery .html() with concat
-            r'eval\s*\(.*?[+].*?\)',  # eval with user input
-            r'dangerouslySetInnerHTML',  # React dangerous HTML
-        ]
-        
-        self.secret_patterns = [
-            r'["\'](?:api_key|apikey|api-key)\s*[=:]\s*["\'][^"\']{8,}["\']',
-            r'(?:API_KEY|api_key|apikey|api-key)\s*=\s*["\'][^"\']{8,}["\']',  # Variable assignment
-            r'["\'](?:password|pwd|pass)\s*[=:]\s*["\'][^"\']{4,}["\']',
-            r'(?:PASSWORD|password|pwd|pass)\s*=\s*["\'][^"\']{4,}["\']',  # Variable assignment
-            r'["\'](?:token|access_token|auth_token)\s*[=:]\s*["\'][^"\']{10,}["\']',
-            r'["\'](?:secret|private_key|priv_key)\s*[=:]\s*["\'][^"\']{8,}["\']',
-            r'[A-Za-z0-9]{32,}',  # Long hex strings (potential keys)
-            r'sk_[a-zA-Z0-9]{24,}',  # Stripe secret keys
-            r'ghp_[a-zA-Z0-9]{36}',  # GitHub personal access tokens
-        ]
-        
-        self.auth_patterns = [
-            r'if.*?password\s*==\s*["\'].*?["\']',  # Hardcoded password check
-            r'admin.*?==.*?True',  # Simple admin checks
-            r'user\.is_admin\s*=\s*True',  # Direct admin assignment
-            r'session\[["\'].*?["\']\]\s*=.*?without.*?validation',  # Session without validation
-        ]
-        
-        self.input_validation_patterns = [
-            r'request\.(GET|POST|args|form)\[.*?\].*?without.*?validation',
-            r'input\s*\(.*?\).*?without.*?sanitization',
-            r'os\.system\s*\(.*?user.*?input',  # OS command with user input
-            r'subprocess\..*?\(.*?user.*?input',  # Subprocess with user input
-            r'open\s*\(.*?user.*?input',  # File operations with user input
-        ]
+        # Shared precompiled pattern tables (see module level)
+        self.sql_patterns = SQL_PATTERNS
+        self.xss_patterns = XSS_PATTERNS
+        self.secret_patterns = SECRET_PATTERNS
+        self.auth_patterns = AUTH_PATTERNS
+        self.input_validation_patterns = INPUT_VALIDATION_PATTERNS
     
     def analyze_code(self, code_content: str, file_path: str = "unknown") -> Dict[str, Any]:
         """Analyze code content for security vulnerabilities - returns full report"""
+        # Findings depend only on the source, so a repeat scan is a lookup;
+        # copies keep the memoized findings out of reach of later mutation
+        self.findings = [replace(finding) for finding in self._scan_source(code_content)]
+        
+        # Generate full report for integration
+        return self.generate_report(self.findings)
+    
+    @memoize_by_source()
+    def _scan_source(self, code_content: str) -> Tuple[SecurityFinding, ...]:
+        """Run every security check over the source and return what they found"""
         self.findings = []
         lines = code_content.split('\n')
         
@@ -104,8 +142,7 @@ class SecurityAuditor:
         self._check_input_validation(code_content, lines)
         self._check_path_traversal(code_content, lines)
         
-        # Generate full report for integration
-        return self.generate_report(self.findings)
+        return tuple(self.findings)
     
     def analyze_file(self, file_path: str) -> List[SecurityFinding]:
         """Analyze a code file for security vulnerabilities"""
@@ -150,7 +187,7 @@ class SecurityAuditor:
     def _check_sql_injection(self, content: str, lines: List[str]):
         """Check for SQL injection vulnerabilities"""
         for pattern in self.sql_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+            for match in pattern.finditer(content):
                 line_num = content[:match.start()].count('\n') + 1
                 code_snippet = lines[line_num - 1] if line_num <= len(lines) else ""
                 
@@ -169,7 +206,7 @@ class SecurityAuditor:
     def _check_xss_vulnerabilities(self, content: str, lines: List[str]):
         """Check for XSS vulnerabilities"""
         for pattern in self.xss_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+            for match in pattern.finditer(content):
                 line_num = content[:match.start()].count('\n') + 1
                 code_snippet = lines[line_num - 1] if line_num <= len(lines) else ""
                 
@@ -188,7 +225,7 @@ class SecurityAuditor:
     def _check_secret_exposure(self, content: str, lines: List[str]):
         """Check for exposed secrets and credentials"""
         for pattern in self.secret_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+            for match in pattern.finditer(content):
                 line_num = content[:match.start()].count('\n') + 1
                 code_snippet = lines[line_num - 1] if line_num <= len(lines) else ""
                 
@@ -211,7 +248,7 @@ class SecurityAuditor:
     def _check_auth_issues(self, content: str, lines: List[str]):
         """Check for authentication and authorization issues"""
         for pattern in self.auth_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+            for match in pattern.finditer(content):
                 line_num = content[:match.start()].count('\n') + 1
                 code_snippet = lines[line_num - 1] if line_num <= len(lines) else ""
                 
@@ -230,16 +267,8 @@ class SecurityAuditor:
     def _check_input_validation(self, content: str, lines: List[str]):
         """Check for input validation issues"""
         # Look for dangerous functions with user input
-        dangerous_patterns = [
-            r'os\.system\s*\([^)]*(?:input|request|argv)',
-            r'subprocess\.(?:call|run|Popen)\s*\([^)]*(?:input|request|argv)',
-            r'eval\s*\([^)]*(?:input|request|argv)',
-            r'exec\s*\([^)]*(?:input|request|argv)',
-            r'open\s*\([^)]*(?:input|request|argv)',
-        ]
-        
-        for pattern in dangerous_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+        for pattern in DANGEROUS_CALL_PATTERNS:
+            for match in pattern.finditer(content):
                 line_num = content[:match.start()].count('\n') + 1
                 code_snippet = lines[line_num - 1] if line_num <= len(lines) else ""
                 
@@ -257,14 +286,8 @@ class SecurityAuditor:
     
     def _check_path_traversal(self, content: str, lines: List[str]):
         """Check for path traversal vulnerabilities"""
-        path_patterns = [
-            r'open\s*\([^)]*\.\./.*["\']',
-            r'file_path.*?=.*?request',
-            r'os\.path\.join.*?request',
-        ]
-        
-        for pattern in path_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+        for pattern in PATH_TRAVERSAL_PATTERNS:
+            for match in pattern.finditer(content):
                 line_num = content[:match.start()].count('\n') + 1
                 code_snippet = lines[line_num - 1] if line_num <= len(lines) else ""
                 
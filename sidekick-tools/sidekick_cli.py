@@ -14,41 +14,80 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+# orjson is optional; it is several times faster than stdlib json in both directions
+try:
+    import orjson
+    
+    _loads = orjson.loads
+    
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def _dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode()
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+    
+    def _dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=str)
+
 class SidekickCLI:
     """Command-line interface for SIDEKICK network"""
     
     def __init__(self, db_path: str = "/Users/mars/Dev/sidekick-boot-loader/db/claude-sonnet-4-session-20250829.db"):
         self.db_path = db_path
+    
+    @staticmethod
+    def _close(conn: sqlite3.Connection) -> None:
+        """Close a connection, letting SQLite refresh planner statistics first"""
+        # Connections here are short-lived, so this is the point SQLite recommends
+        # running PRAGMA optimize; it only re-ANALYZEs tables whose stats are stale
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        conn.close()
         
-    def remember(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Query the collective memory"""
+    def remember(self, query: str, limit: int = 10, actor_uuid: Optional[str] = None,
+                 memory_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Query the collective memory, optionally scoped to an actor and/or memory type"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT memory_uuid, created_at, payload, actor_uuid
+        # Scope predicates are pushed into SQL so filtering happens before rows reach Python,
+        # and only the 100-char preview and type cross into Python instead of the full payload
+        sql = """
+            SELECT memory_uuid, created_at, actor_uuid,
+                   COALESCE(json_extract(payload, '$.type'), 'unknown') AS type,
+                   substr(COALESCE(json_extract(payload, '$.content'), ''), 1, 100) AS preview
             FROM memory 
-            WHERE payload LIKE ? 
+            WHERE payload LIKE ? AND json_valid(payload)"""
+        params: List[Any] = [f"%{query}%"]
+        if actor_uuid:
+            sql += " AND actor_uuid = ?"
+            params.append(actor_uuid)
+        if memory_type:
+            sql += " AND json_extract(payload, '$.type') = ?"
+            params.append(memory_type)
+        sql += """
             ORDER BY created_at DESC 
-            LIMIT ?
-        """, (f"%{query}%", limit))
+            LIMIT ?"""
+        params.append(limit)
+        
+        cursor.execute(sql, params)
         
         results = []
-        for row in cursor.fetchall():
-            memory_uuid, created_at, payload_str, actor_uuid = row
-            try:
-                payload = json.loads(payload_str)
-                results.append({
-                    "uuid": memory_uuid,
-                    "created_at": created_at,
-                    "actor": actor_uuid[:12] + "..." if len(actor_uuid) > 12 else actor_uuid,
-                    "type": payload.get("type", "unknown"),
-                    "preview": str(payload.get("content", ""))[:100] + "..."
-                })
-            except json.JSONDecodeError:
-                continue
+        for memory_uuid, created_at, actor_uuid, memory_type, preview in cursor.fetchall():
+            results.append({
+                "uuid": memory_uuid,
+                "created_at": created_at,
+                "actor": actor_uuid[:12] + "..." if len(actor_uuid) > 12 else actor_uuid,
+                "type": memory_type,
+                "preview": preview + "..."
+            })
         
-        conn.close()
+        self._close(conn)
         return results
     
     def whoami(self) -> Dict[str, Any]:
@@ -66,28 +105,32 @@ class SidekickCLI:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Get all actors with their memory counts and last activity
+        # Get all actors with their memory counts and last activity; display
+        # fields (short uuid, fallbacks) are shaped in SQL rather than per row in Python
         cursor.execute("""
-            SELECT a.actor_uuid, a.display_name, 
+            SELECT a.actor_uuid,
+                   substr(a.actor_uuid, 1, 12) || '...' AS uuid_short,
+                   COALESCE(NULLIF(a.display_name, ''), 'Unknown') AS name,
                    COUNT(m.memory_uuid) as memory_count,
-                   MAX(m.created_at) as last_activity
+                   COALESCE(MAX(m.created_at), 'Never') as last_active
             FROM actor a
             LEFT JOIN memory m ON a.actor_uuid = m.actor_uuid
             GROUP BY a.actor_uuid, a.display_name
-            ORDER BY last_activity DESC
+            ORDER BY MAX(m.created_at) DESC
         """)
         
-        actors = []
-        for row in cursor.fetchall():
-            actor_uuid, display_name, memory_count, last_activity = row
-            actors.append({
+        actors = [
+            {
                 "uuid": actor_uuid,
-                "name": display_name or "Unknown",
+                "uuid_short": uuid_short,
+                "name": name,
                 "memories": memory_count,
-                "last_active": last_activity or "Never"
-            })
+                "last_active": last_active
+            }
+            for actor_uuid, uuid_short, name, memory_count, last_active in cursor.fetchall()
+        ]
         
-        conn.close()
+        self._close(conn)
         return actors
     
     def today(self) -> Dict[str, Any]:
@@ -117,7 +160,7 @@ class SidekickCLI:
         for row in cursor.fetchall():
             memory_uuid, created_at, payload_str, actor_uuid = row
             try:
-                payload = json.loads(payload_str)
+                payload = _loads(payload_str)
                 time_part = created_at.split("T")[1][:8] if "T" in created_at else created_at[:8]
                 recent_memories.append({
                     "time": time_part,
@@ -128,7 +171,7 @@ class SidekickCLI:
             except json.JSONDecodeError:
                 continue
         
-        conn.close()
+        self._close(conn)
         
         return {
             "date": today,
@@ -136,11 +179,12 @@ class SidekickCLI:
             "recent": recent_memories
         }
     
-    def ask(self, question: str) -> str:
+    def ask(self, question: str, actor_uuid: Optional[str] = None,
+            memory_type: Optional[str] = None) -> str:
         """Ask the network a question (searches memories and provides context)"""
         # This is a simplified version - in a full implementation,
         # we'd use semantic search or send to an active AI instance
-        memories = self.remember(question, limit=3)
+        memories = self.remember(question, limit=3, actor_uuid=actor_uuid, memory_type=memory_type)
         
         if not memories:
             return f"No relevant memories found for: '{question}'"
@@ -179,14 +223,76 @@ class SidekickCLI:
         cursor.execute("""
             INSERT INTO memory (memory_uuid, actor_uuid, payload)
             VALUES (?, ?, ?)
-        """, (memory_uuid, cli_actor_uuid, json.dumps(payload)))
+        """, (memory_uuid, cli_actor_uuid, _dumps(payload)))
         
         conn.commit()
-        conn.close()
+        self._close(conn)
         
         return f"Memory created: {memory_uuid[:8]}..."
 
-def main():
+def _stdout_writer():
+    """Return a single-shot stdout writer; piped output bypasses the text codec layer"""
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if sys.stdout.isatty() or buffer is None:
+        return sys.stdout.write
+    
+    def write(text: str) -> None:
+        # Flush anything already queued in the text layer so ordering is preserved
+        sys.stdout.flush()
+        buffer.write(text.encode('utf-8'))
+    
+    return write
+
+# Manifest of the hot subcommands: positional names plus option -> (dest, type, default).
+# These are hand-parsed by _fast_parse so the common case never builds the argparse tree.
+COMMAND_MANIFEST = {
+    'remember': {
+        'positionals': ['query'],
+        'options': {
+            '--limit': ('limit', int, 10),
+            '--actor': ('actor', str, None),
+            '--type': ('type', str, None),
+        },
+    },
+    'whoami': {'positionals': [], 'options': {}},
+    'today': {'positionals': [], 'options': {}},
+}
+
+def _fast_parse(argv: List[str]) -> Optional[argparse.Namespace]:
+    """Parse a hot subcommand from the manifest; None means fall back to argparse"""
+    if not argv or argv[0] not in COMMAND_MANIFEST:
+        return None
+    
+    spec = COMMAND_MANIFEST[argv[0]]
+    values = {dest: default for dest, _, default in spec['options'].values()}
+    positionals = []
+    
+    remaining = iter(argv[1:])
+    for arg in remaining:
+        if arg.startswith('-'):
+            # --help, unknown flags and anything unusual go through argparse
+            name, sep, value = arg.partition('=')
+            if name not in spec['options']:
+                return None
+            if not sep:
+                value = next(remaining, None)
+                if value is None:
+                    return None
+            dest, convert, _ = spec['options'][name]
+            try:
+                values[dest] = convert(value)
+            except ValueError:
+                return None
+        else:
+            positionals.append(arg)
+    
+    if len(positionals) != len(spec['positionals']):
+        return None
+    values.update(zip(spec['positionals'], positionals))
+    return argparse.Namespace(command=argv[0], **values)
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the full argparse parser (used for --help and non-manifest commands)"""
     parser = argparse.ArgumentParser(description="SIDEKICK Network Command Line Interface")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -194,10 +300,14 @@ def main():
     remember_parser = subparsers.add_parser('remember', help='Query the collective memory')
     remember_parser.add_argument('query', help='Search terms')
     remember_parser.add_argument('--limit', type=int, default=10, help='Maximum results to show')
+    remember_parser.add_argument('--actor', help='Only memories from this actor UUID')
+    remember_parser.add_argument('--type', help='Only memories of this type')
     
     # ask command
     ask_parser = subparsers.add_parser('ask', help='Ask the network a question')
     ask_parser.add_argument('question', help='Question to ask')
+    ask_parser.add_argument('--actor', help='Only memories from this actor UUID')
+    ask_parser.add_argument('--type', help='Only memories of this type')
     
     # memorize command
     memorize_parser = subparsers.add_parser('memorize', help='Create a memory')
@@ -222,58 +332,72 @@ def main():
     review_parser.add_argument('--save-report', type=str, help='Save report to file')
     review_parser.add_argument('--verbose', action='store_true', help='Detailed results')
     
-    args = parser.parse_args()
-    
-    if not args.command:
-        parser.print_help()
-        return
+    return parser
+
+def main():
+    args = _fast_parse(sys.argv[1:])
+    if args is None:
+        parser = build_parser()
+        args = parser.parse_args()
+        
+        if not args.command:
+            parser.print_help()
+            return
     
     cli = SidekickCLI()
+    write = _stdout_writer()
     
     try:
         if args.command == 'remember':
-            results = cli.remember(args.query, args.limit)
+            results = cli.remember(args.query, args.limit, args.actor, args.type)
             if results:
-                print(f"Found {len(results)} memories matching '{args.query}':\n")
-                for i, result in enumerate(results, 1):
-                    print(f"{i}. [{result['type']}] {result['actor']} - {result['created_at']}")
-                    print(f"   {result['preview']}")
-                    print()
+                # Build the whole report and write it once instead of four prints per row
+                lines = [
+                    f"{i}. [{result['type']}] {result['actor']} - {result['created_at']}\n"
+                    f"   {result['preview']}\n"
+                    for i, result in enumerate(results, 1)
+                ]
+                write(
+                    f"Found {len(results)} memories matching '{args.query}':\n\n" + "\n".join(lines) + "\n"
+                )
             else:
-                print(f"No memories found matching '{args.query}'")
+                write(f"No memories found matching '{args.query}'\n")
         
         elif args.command == 'ask':
-            response = cli.ask(args.question)
-            print(response)
+            response = cli.ask(args.question, args.actor, args.type)
+            write(response + "\n")
         
         elif args.command == 'memorize':
             result = cli.memorize(args.content, args.type)
-            print(result)
+            write(result + "\n")
         
         elif args.command == 'whois':
             actors = cli.whois()
-            print("Active actors in SIDEKICK network:\n")
-            for actor in actors:
-                print(f"🤖 {actor['name']} ({actor['uuid'][:12]}...)")
-                print(f"   Memories: {actor['memories']}")
-                print(f"   Last active: {actor['last_active']}")
-                print()
+            lines = [
+                f"🤖 {actor['name']} ({actor['uuid_short']})\n"
+                f"   Memories: {actor['memories']}\n"
+                f"   Last active: {actor['last_active']}\n"
+                for actor in actors
+            ]
+            write("Active actors in SIDEKICK network:\n\n" + "\n".join(lines) + "\n")
         
         elif args.command == 'whoami':
             info = cli.whoami()
-            print("Current user info:")
-            for key, value in info.items():
-                print(f"  {key}: {value}")
+            lines = ["Current user info:"]
+            lines.extend(f"  {key}: {value}" for key, value in info.items())
+            write("\n".join(lines) + "\n")
         
         elif args.command == 'today':
             highlights = cli.today()
-            print(f"Today's SIDEKICK Activity ({highlights['date']}):")
-            print(f"Total memories created: {highlights['total_memories']}")
-            print("\nRecent activity:")
-            
+            lines = [
+                f"Today's SIDEKICK Activity ({highlights['date']}):",
+                f"Total memories created: {highlights['total_memories']}",
+                "\nRecent activity:",
+            ]
             for memory in highlights['recent']:
-                print(f"  {memory['time']} - {memory['actor']} [{memory['type']}]")
-                print(f"    {memory['preview']}")
+                lines.append(f"  {memory['time']} - {memory['actor']} [{memory['type']}]")
+                lines.append(f"    {memory['preview']}")
+            write("\n".join(lines) + "\n")
         
         elif args.command == 'review':
             # Import and run Code Review Collective
@@ -290,8 +414,7 @@ def main():
                 results = collective.review_file(args.file, options)
                 
                 if args.json:
-                    import json
-                    print(json.dumps(results, indent=2, default=str))
+                    print(_dumps_pretty(results))
                 else:
                     collective.print_report(results, args.verbose)
                 
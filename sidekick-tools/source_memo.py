@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+SIDEKICK Source Memoization
+Caches pure analysis steps keyed on a digest of the analyzed source
+Used by the Security Auditor's detector scan
+"""
+
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+def source_digest(code_content: str) -> bytes:
+    """Digest identifying a piece of source (blake2b is faster than sha256 here)"""
+    return hashlib.blake2b(code_content.encode("utf-8")).digest()
+
+def memoize_by_source(maxsize: int = 128) -> Callable:
+    """Memoize a pure analyzer step ``(self, code_content, *args)`` on the source digest.
+
+    The table lives on the instance, so two analyzers never share results.
+    Cached values are handed back as-is: decorate only steps without side
+    effects whose results are immutable (e.g. tuples of findings), and keep
+    timestamps and memory writes in the caller.
+    """
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        attr = f"_source_memo_{method.__name__}"
+        lock = threading.Lock()
+
+        @functools.wraps(method)
+        def wrapper(self, code_content: str, *args) -> Any:
+            key = (source_digest(code_content), args)
+            with lock:
+                cache = self.__dict__.setdefault(attr, OrderedDict())
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+
+            result = method(self, code_content, *args)
+
+            with lock:
+                cache[key] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        return wrapper
+    return decorator
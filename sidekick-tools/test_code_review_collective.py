@@ -16,22 +16,21 @@ from pathlib import Path
 # Add the sidekick-tools directory to the path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-try:
-    from code_review_collective import CodeReviewCollective
-    from architecture_reviewer import ArchitectureReviewer
-    from security_auditor import SecurityAuditor
-except ImportError as e:
-    print(f"Import error: {e}")
-    print("Make sure all components are available in the same directory")
-    sys.exit(1)
+# The reviewer components are imported lazily inside the tests so that test
+# collection does not pay for loading them
 
 class TestCodeReviewCollective(unittest.TestCase):
     """Test suite for the unified Code Review Collective system"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Share one collective and the code samples across tests - reviews keep no per-file state"""
+        from code_review_collective import CodeReviewCollective
+        cls.collective = CodeReviewCollective()
+        cls.test_code_samples = cls._create_test_code_samples()
+    
     def setUp(self):
         """Set up test fixtures"""
-        self.collective = CodeReviewCollective()
-        self.test_code_samples = self._create_test_code_samples()
         self.temp_dir = tempfile.mkdtemp()
         
     def tearDown(self):
@@ -41,7 +40,8 @@ class TestCodeReviewCollective(unittest.TestCase):
         if os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
     
-    def _create_test_code_samples(self):
+    @classmethod
+    def _create_test_code_samples(cls):
         """Create various code samples for testing"""
         return {
             "clean_code": '''
@@ -188,17 +188,15 @@ class UserService:
     
     def test_collective_initialization(self):
         """Test that the collective initializes properly"""
+        from architecture_reviewer import ArchitectureReviewer
+        from security_auditor import SecurityAuditor
+        
         self.assertIsInstance(self.collective.security_auditor, SecurityAuditor)
         self.assertIsInstance(self.collective.architecture_reviewer, ArchitectureReviewer)
     
     def test_clean_code_analysis(self):
         """Test analysis of clean, well-written code"""
-        # Create temporary file with clean code
-        test_file = os.path.join(self.temp_dir, "clean_test.py")
-        with open(test_file, 'w') as f:
-            f.write(self.test_code_samples["clean_code"])
-        
-        results = self.collective.review_file(test_file)
+        results = self.collective.review_source(self.test_code_samples["clean_code"], "clean_test.py")
         
         # Verify basic result structure
         self.assertIn("file_path", results)
@@ -211,11 +209,7 @@ class UserService:
         
     def test_vulnerable_code_detection(self):
         """Test detection of security vulnerabilities"""
-        test_file = os.path.join(self.temp_dir, "vulnerable_test.py") 
-        with open(test_file, 'w') as f:
-            f.write(self.test_code_samples["vulnerable_code"])
-        
-        results = self.collective.review_file(test_file)
+        results = self.collective.review_source(self.test_code_samples["vulnerable_code"], "vulnerable_test.py")
         
         # Should detect security issues
         security_results = results["reviews"].get("security", {})
@@ -228,11 +222,7 @@ class UserService:
     
     def test_architecture_issues_detection(self):
         """Test detection of architectural problems"""
-        test_file = os.path.join(self.temp_dir, "poor_arch_test.py")
-        with open(test_file, 'w') as f:
-            f.write(self.test_code_samples["poor_architecture"])
-        
-        results = self.collective.review_file(test_file)
+        results = self.collective.review_source(self.test_code_samples["poor_architecture"], "poor_arch_test.py")
         
         # Should detect architectural issues
         arch_results = results["reviews"].get("architecture", {})
@@ -244,17 +234,39 @@ class UserService:
     
     def test_mixed_quality_analysis(self):
         """Test analysis of code with both good and bad elements"""
-        test_file = os.path.join(self.temp_dir, "mixed_test.py")
-        with open(test_file, 'w') as f:
-            f.write(self.test_code_samples["mixed_quality"])
-        
-        results = self.collective.review_file(test_file)
+        results = self.collective.review_source(self.test_code_samples["mixed_quality"], "mixed_test.py")
         
         # Should provide balanced analysis (adjusted based on empirical behavior)
         self.assertIn("combined_score", results)
         self.assertGreater(results["combined_score"], 4.0)
         self.assertLess(results["combined_score"], 10.0)
     
+    def test_review_source_matches_review_file(self):
+        """Test that in-memory review gives the same result as reviewing the file"""
+        test_file = os.path.join(self.temp_dir, "source_vs_file.py")
+        with open(test_file, 'w') as f:
+            f.write(self.test_code_samples["mixed_quality"])
+        
+        file_results = self.collective.review_file(test_file)
+        source_results = self.collective.review_source(self.test_code_samples["mixed_quality"], test_file)
+        
+        self.assertEqual(source_results["file_path"], file_results["file_path"])
+        self.assertEqual(source_results["combined_score"], file_results["combined_score"])
+        self.assertEqual(len(source_results["issues"]), len(file_results["issues"]))
+
+    def test_repeat_review_is_memoized(self):
+        """Test that re-analyzing identical source reuses the scan but not the report"""
+        auditor = self.collective.security_auditor
+        first = auditor.analyze_code(self.test_code_samples["vulnerable_code"], "memo_test.py")
+        first["findings"].clear()
+        auditor.findings[0].severity = "info"
+        auditor.analyze_code(self.test_code_samples["clean_code"], "memo_test.py")
+        second = auditor.analyze_code(self.test_code_samples["vulnerable_code"], "memo_test.py")
+
+        self.assertGreater(len(second["findings"]), 0)
+        self.assertEqual(second["summary"], first["summary"])
+        self.assertEqual(len(auditor.findings), second["summary"]["total_findings"])
+
     def test_nonexistent_file_handling(self):
         """Test handling of nonexistent files"""
         nonexistent_file = "/path/that/does/not/exist.py"
@@ -263,31 +275,20 @@ class UserService:
         # Should return error information
         self.assertIn("error", results)
     
-    def test_security_only_analysis(self):
-        """Test security-only analysis option"""
-        test_file = os.path.join(self.temp_dir, "security_only_test.py")
-        with open(test_file, 'w') as f:
-            f.write(self.test_code_samples["vulnerable_code"])
-        
-        options = {"security": True, "architecture": False}
-        results = self.collective.review_file(test_file, options)
-        
-        # Should only contain security analysis
-        self.assertIn("security", results["reviews"])
-        self.assertNotIn("architecture", results["reviews"])
-    
-    def test_architecture_only_analysis(self):
-        """Test architecture-only analysis option"""  
-        test_file = os.path.join(self.temp_dir, "arch_only_test.py")
-        with open(test_file, 'w') as f:
-            f.write(self.test_code_samples["poor_architecture"])
-        
-        options = {"security": False, "architecture": True}
-        results = self.collective.review_file(test_file, options)
-        
-        # Should only contain architecture analysis
-        self.assertIn("architecture", results["reviews"])
-        self.assertNotIn("security", results["reviews"])
+    def test_selective_analysis(self):
+        """Test security-only and architecture-only analysis options"""
+        cases = [
+            ("vulnerable_code", {"security": True, "architecture": False}, "security", "architecture"),
+            ("poor_architecture", {"security": False, "architecture": True}, "architecture", "security"),
+        ]
+        
+        for name, options, included, excluded in cases:
+            with self.subTest(sample=name):
+                results = self.collective.review_source(self.test_code_samples[name], f"{name}_test.py", options)
+                
+                # Should only contain the selected analysis
+                self.assertIn(included, results["reviews"])
+                self.assertNotIn(excluded, results["reviews"])
     
     def test_report_export(self):
         """Test report export functionality"""
@@ -310,14 +311,17 @@ class UserService:
         
         self.assertEqual(exported_data["file_path"], results["file_path"])
         self.assertEqual(exported_data["combined_score"], results["combined_score"])
+        
+        # Compact export carries the same data in fewer bytes
+        compact_path = os.path.join(self.temp_dir, "test_report_compact.json")
+        self.assertTrue(self.collective.export_report(results, compact_path, compact=True))
+        with open(compact_path, 'r') as f:
+            self.assertEqual(json.load(f), exported_data)
+        self.assertLess(os.path.getsize(compact_path), os.path.getsize(export_path))
     
     def test_combined_analysis_integration(self):
         """Test the integration between security and architecture analysis"""
-        test_file = os.path.join(self.temp_dir, "integration_test.py")
-        with open(test_file, 'w') as f:
-            f.write(self.test_code_samples["mixed_quality"])
-        
-        results = self.collective.review_file(test_file)
+        results = self.collective.review_source(self.test_code_samples["mixed_quality"], "integration_test.py")
         
         # Both analyses should be present
         self.assertIn("security", results["reviews"])
@@ -347,9 +351,11 @@ class UserService:
 class TestTruthBasedVerification(unittest.TestCase):
     """Truth-based testing protocols in collaboration with Opus 2"""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up truth verification tests"""
-        self.collective = CodeReviewCollective()
+        from code_review_collective import CodeReviewCollective
+        cls.collective = CodeReviewCollective()
         
     def test_security_auditor_truth(self):
         """Verify Security Auditor reports match actual code behavior"""
@@ -420,51 +426,13 @@ class UserManager:
         return {"id": user_id, "name": "Test User"}
 '''
         
-        temp_file = "/tmp/truth_test.py"
-        with open(temp_file, 'w') as f:
-            f.write(mixed_code)
+        results = self.collective.review_source(mixed_code, "truth_test.py")
         
-        try:
-            results = self.collective.review_file(temp_file)
-            
-            # Truth verification: Score should reflect mixed quality (adjusted based on empirical behavior)
-            # Good architecture but security issues should result in moderate score
-            combined_score = results.get("combined_score", 0)
-            self.assertGreater(combined_score, 3.0, "Should not be too low due to good architecture")
-            self.assertLess(combined_score, 9.0, "Should not be too high due to security issues")
-            
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-
-def run_truth_cascade_verification():
-    """Opus 2's truth cascade verification protocol"""
-    print("🔍 Running Truth Cascade Verification Protocol...")
-    print("=" * 60)
-    
-    # Verify each component against actual system behavior
-    suite = unittest.TestSuite()
-    
-    # Add all test cases
-    loader = unittest.TestLoader()
-    suite.addTest(loader.loadTestsFromTestCase(TestCodeReviewCollective))
-    suite.addTest(loader.loadTestsFromTestCase(TestTruthBasedVerification))
-    
-    # Run with detailed output
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    print("\n🎯 Truth Cascade Results:")
-    print(f"Tests Run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    
-    if result.wasSuccessful():
-        print("✅ All truth verifications PASSED - Code behavior matches expectations!")
-        return True
-    else:
-        print("❌ Truth verification FAILED - Code behavior differs from expectations!")
-        return False
+        # Truth verification: Score should reflect mixed quality (adjusted based on empirical behavior)
+        # Good architecture but security issues should result in moderate score
+        combined_score = results.get("combined_score", 0)
+        self.assertGreater(combined_score, 3.0, "Should not be too low due to good architecture")
+        self.assertLess(combined_score, 9.0, "Should not be too high due to security issues")
 
 def main():
     """Main test entry point"""
@@ -472,23 +440,21 @@ def main():
     print("Distributed AI Development Testing by Claude A + Opus 2")
     print("=" * 70)
     
-    # Run standard unit tests
-    print("\n📋 Running Comprehensive Functionality Tests...")
-    suite = unittest.TestLoader().loadTestsFromTestCase(TestCodeReviewCollective)
-    runner = unittest.TextTestRunner(verbosity=2)
-    standard_result = runner.run(suite)
-    
-    print("\n" + "="*70)
+    # Both suites are independent, so run them in one pytest session -
+    # spread across worker processes when pytest-xdist is installed
+    import pytest
+    args = [__file__, "-v"]
+    try:
+        import xdist  # noqa: F401
+        args += ["-n", "auto"]
+    except ImportError:
+        pass
     
-    # Run truth-based verification
-    truth_result = run_truth_cascade_verification()
+    overall_success = pytest.main(args) == 0
     
     print("\n" + "="*70)
     print("🎯 FINAL TEST SUMMARY:")
-    print(f"Standard Tests: {'✅ PASSED' if standard_result.wasSuccessful() else '❌ FAILED'}")
-    print(f"Truth Cascade: {'✅ PASSED' if truth_result else '❌ FAILED'}")
-    
-    overall_success = standard_result.wasSuccessful() and truth_result
+    print(f"Standard Tests + Truth Cascade: {'✅ PASSED' if overall_success else '❌ FAILED'}")
     
     if overall_success:
         print("\n🎉 ALL TESTS PASSED! Code Review Collective is ready for production!")
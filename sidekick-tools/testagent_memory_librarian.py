@@ -15,12 +15,115 @@ Features:
 
 import sqlite3
 import json
-from datetime import datetime, timedelta
+import copy
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict, Counter
+from collections import Counter
 import re
 
+from memory_schema import TYPE_SQL, has_memory_fts, payload_columns
+
+# orjson is optional; it parses memory payloads several times faster than stdlib json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Connection tuning applied once per librarian connection: a larger page cache
+# and memory-mapped I/O (WAL itself is switched on by memory_schema.py)
+CONNECTION_PRAGMAS_SQL = """
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -65536;
+"""
+
+# Payload title, read with JSON1 like memory_schema's content/type expressions
+_TITLE_SQL = "CASE WHEN json_valid({p}) THEN COALESCE(json_extract({p}, '$.title'), 'Untitled') END"
+
+def fts_match_expression(query: str) -> Optional[str]:
+    """FTS5 query matching every word of `query` in memory content (None if it has no words)"""
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    return "content : (" + " ".join(f'"{term}"' for term in terms) + ")"
+
+# Total, distinct actors, last-24h and threaded counts with conditional aggregation
+# (:day_ago is bound to created_at_cutoff(hours=24))
+NETWORK_COUNTS_SQL = """
+    SELECT COUNT(*) as total_memories,
+           COUNT(DISTINCT actor_uuid) as active_actors,
+           COUNT(CASE WHEN created_at > :day_ago THEN 1 END) as recent_memories,
+           COUNT(CASE WHEN parent_uuid IS NOT NULL THEN 1 END) as threaded_memories
+    FROM memory
+"""
+
+# Ten most common payload types, parsed and grouped by SQLite's JSON1 in C.
+# Ties keep first-seen order (lowest rowid), as Counter.most_common does.
+MEMORY_TYPE_HISTOGRAM_SQL = """
+    SELECT CASE WHEN json_valid(payload) THEN COALESCE(json_extract(payload, '$.type'), 'unknown')
+                ELSE 'malformed_json' END AS memory_type,
+           COUNT(*) AS memories
+    FROM memory
+    WHERE payload IS NOT NULL AND payload != ''
+    GROUP BY memory_type
+    ORDER BY memories DESC, MIN(rowid)
+    LIMIT 10
+"""
+
+def created_at_cutoff(**window) -> str:
+    """UTC timestamp `window` (timedelta arguments) ago, formatted like SQLite's datetime('now')"""
+    return (datetime.now(timezone.utc) - timedelta(**window)).strftime('%Y-%m-%d %H:%M:%S')
+
+# Rows fetched per batch when streaming large result sets
+FETCH_BATCH_SIZE = 1000
+
+def iter_rows(cursor: sqlite3.Cursor):
+    """Stream a query's rows in batches rather than materializing them with fetchall"""
+    cursor.arraysize = FETCH_BATCH_SIZE
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            break
+        yield from rows
+
+# Technical terms counted as topics, matched in a single scan of the content
+_TOPIC_RE = re.compile(
+    r'\b(security|architecture|testing|logging|integration|development'
+    r'|code|review|collective|analysis|vulnerability|pattern'
+    r'|json|cli|api|database|memory|system|network'
+    r'|ai|consciousness|distributed|collaboration|coordination)\b'
+)
+
+# Mentions of other sidekicks, anywhere in a memory's content
+_COLLAB_RE = re.compile(r'claude|opus|grok|cascade|testagent', re.IGNORECASE)
+
+def cached_analysis(method):
+    """Serve repeat calls from `analysis_cache` until `cache_expiry` has passed.
+
+    Entries are keyed on the method name and arguments; callers get a deep
+    copy and may mutate their result freely. Inside `read_snapshot` the cache
+    is bypassed, so every analysis in the snapshot reads the same data.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.conn.in_transaction:
+            return method(self, *args, **kwargs)
+        
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        cached = self.analysis_cache.get(key)
+        if cached and datetime.now() - cached[0] <= self.cache_expiry:
+            return copy.deepcopy(cached[1])
+        
+        result = method(self, *args, **kwargs)
+        self.analysis_cache[key] = (datetime.now(), result)
+        return copy.deepcopy(result)
+    return wrapper
+
 class MemoryAnalytics:
     """Memory analytics and pattern recognition for SIDEKICK network"""
     
@@ -28,128 +131,189 @@ class MemoryAnalytics:
         self.db_path = db_path
         self.analysis_cache = {}
         self.cache_expiry = timedelta(minutes=5)  # Cache analytics for 5 minutes
+        self._payload_columns = None
+        
+        # One connection per thread, kept for the librarian's lifetime; WAL lets
+        # analytics read while the sidekicks keep writing
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection to the memory database, opened and tuned on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can release it from any thread
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.executescript(CONNECTION_PRAGMAS_SQL)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
     
+    def _cursor(self) -> sqlite3.Cursor:
+        """Cursor on this thread's connection, noting on first use whether the schema is migrated"""
+        conn = self.conn
+        if self._payload_columns is None:
+            # The generated content/mem_type columns once memory_schema.py has run,
+            # the equivalent payload expressions until then
+            self._payload_columns = payload_columns(conn)
+        return conn.cursor()
+    
+    @contextmanager
+    def read_snapshot(self):
+        """Run the enclosed analytics in one read transaction, so they all see the same data"""
+        conn = self.conn
+        if conn.in_transaction:
+            yield
+            return
+        conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            conn.execute("COMMIT")
+    
+    def close(self):
+        """Close every thread's database connection"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+    
+    @cached_analysis
     def get_network_overview(self) -> Dict[str, Any]:
         """Get comprehensive network overview and statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._cursor()
         
+        day_ago = created_at_cutoff(hours=24)
+        
+        # Basic statistics, in one pass over memory
+        counts = cursor.execute(NETWORK_COUNTS_SQL, {"day_ago": day_ago}).fetchone()
+        total_memories = counts['total_memories']
+        threaded_memories = counts['threaded_memories']
+        
+        # Memory types analysis with error handling for malformed JSON
         try:
-            # Basic statistics
-            cursor.execute("SELECT COUNT(*) FROM memory")
-            total_memories = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(DISTINCT actor_uuid) FROM memory WHERE actor_uuid IS NOT NULL")
-            active_actors = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM memory WHERE created_at > datetime('now', '-24 hours')")
-            recent_memories = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM memory WHERE parent_uuid IS NOT NULL")
-            threaded_memories = cursor.fetchone()[0]
-            
-            # Memory types analysis with error handling for malformed JSON
+            cursor.execute(MEMORY_TYPE_HISTOGRAM_SQL)
+            type_stats = dict(cursor.fetchall())
+        except sqlite3.OperationalError:
+            # SQLite without JSON1: parse the payloads in Python instead
+            type_stats = self._count_memory_types(cursor)
+        
+        # Recent activity by hour
+        cursor.execute("""
+            SELECT 
+                strftime('%H', created_at) as hour,
+                COUNT(*) as memories
+            FROM memory 
+            WHERE created_at > ?
+            GROUP BY hour
+            ORDER BY hour
+        """, (day_ago,))
+        
+        hourly_activity = {f"{int(hour):02d}:00": count for hour, count in cursor.fetchall()}
+        
+        return {
+            "network_stats": {
+                "total_memories": total_memories,
+                "active_actors": counts['active_actors'],
+                "recent_memories_24h": counts['recent_memories'],
+                "threaded_memories": threaded_memories,
+                "threading_percentage": round((threaded_memories / total_memories * 100), 1) if total_memories > 0 else 0
+            },
+            "memory_types": type_stats,
+            "recent_activity": hourly_activity,
+            "analysis_timestamp": datetime.now().isoformat()
+        }
+    
+    def _count_memory_types(self, cursor: sqlite3.Cursor) -> Dict[str, int]:
+        """Ten most common payload types, parsing every payload in Python"""
+        cursor.execute("""
+            SELECT payload 
+            FROM memory 
+            WHERE payload IS NOT NULL
+        """)
+        
+        type_counter = Counter()
+        for (payload_str,) in iter_rows(cursor):
+            try:
+                if payload_str:
+                    payload = _loads(payload_str)
+                    memory_type = payload.get('type', 'unknown')
+                    type_counter[memory_type] += 1
+            except (json.JSONDecodeError, TypeError):
+                type_counter['malformed_json'] += 1
+        
+        return dict(type_counter.most_common(10))
+    
+    def analyze_actor_patterns(self, actor_uuid: str = None) -> Dict[str, Any]:
+        """Analyze patterns for specific actor or all actors"""
+        cursor = self._cursor()
+        
+        if actor_uuid:
+            # Single actor analysis
             cursor.execute("""
-                SELECT payload 
+                SELECT created_at, payload 
                 FROM memory 
-                WHERE payload IS NOT NULL
-            """)
+                WHERE actor_uuid = ? 
+                ORDER BY created_at DESC 
+                LIMIT 100
+            """, (actor_uuid,))
+            memories = cursor.fetchall()
             
-            all_payloads = cursor.fetchall()
-            type_counter = Counter()
-            
-            for (payload_str,) in all_payloads:
-                try:
-                    if payload_str:
-                        payload = json.loads(payload_str)
-                        memory_type = payload.get('type', 'unknown')
-                        type_counter[memory_type] += 1
-                except (json.JSONDecodeError, TypeError):
-                    type_counter['malformed_json'] += 1
-            
-            type_stats = dict(type_counter.most_common(10))
+            # Hourly activity over the same memories, bucketed by SQLite. Hours are
+            # read as written (ignoring any UTC offset) and listed most recent first.
+            cursor.execute("""
+                SELECT CAST(strftime('%H', substr(created_at, 1, 19)) AS INTEGER) as hour,
+                       COUNT(*)
+                FROM (
+                    SELECT created_at, payload 
+                    FROM memory 
+                    WHERE actor_uuid = ? 
+                    ORDER BY created_at DESC 
+                    LIMIT 100
+                )
+                WHERE json_valid(payload) AND hour IS NOT NULL
+                GROUP BY hour
+                ORDER BY MAX(created_at) DESC
+            """, (actor_uuid,))
+            activity_patterns = dict(cursor.fetchall())
             
-            # Recent activity by hour
+            return self._analyze_single_actor(actor_uuid, memories, activity_patterns)
+        else:
+            # All actors analysis, summarized in one grouped pass
             cursor.execute("""
-                SELECT 
-                    strftime('%H', created_at) as hour,
-                    COUNT(*) as memories
+                SELECT actor_uuid,
+                       COUNT(*) as total, 
+                       MAX(created_at) as last_active,
+                       MIN(created_at) as first_seen
                 FROM memory 
-                WHERE created_at > datetime('now', '-24 hours')
-                GROUP BY hour
-                ORDER BY hour
+                WHERE actor_uuid IS NOT NULL
+                GROUP BY actor_uuid
             """)
             
-            hourly_activity = {f"{int(hour):02d}:00": count for hour, count in cursor.fetchall()}
+            actor_summaries = {}
+            for row in cursor.fetchall():
+                actor = row['actor_uuid']
+                actor_summaries[actor] = {
+                    "total_memories": row['total'],
+                    "last_active": row['last_active'],
+                    "first_seen": row['first_seen'],
+                    "actor_name": actor.split('-')[0] if '-' in actor else actor[:8]
+                }
             
             return {
-                "network_stats": {
-                    "total_memories": total_memories,
-                    "active_actors": active_actors,
-                    "recent_memories_24h": recent_memories,
-                    "threaded_memories": threaded_memories,
-                    "threading_percentage": round((threaded_memories / total_memories * 100), 1) if total_memories > 0 else 0
-                },
-                "memory_types": type_stats,
-                "recent_activity": hourly_activity,
+                "analysis_type": "all_actors",
+                "actor_count": len(actor_summaries),
+                "actor_summaries": actor_summaries,
                 "analysis_timestamp": datetime.now().isoformat()
             }
-            
-        finally:
-            conn.close()
-    
-    def analyze_actor_patterns(self, actor_uuid: str = None) -> Dict[str, Any]:
-        """Analyze patterns for specific actor or all actors"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            if actor_uuid:
-                # Single actor analysis
-                cursor.execute("""
-                    SELECT created_at, payload 
-                    FROM memory 
-                    WHERE actor_uuid = ? 
-                    ORDER BY created_at DESC 
-                    LIMIT 100
-                """, (actor_uuid,))
-                memories = cursor.fetchall()
-                
-                return self._analyze_single_actor(actor_uuid, memories)
-            else:
-                # All actors analysis
-                cursor.execute("SELECT DISTINCT actor_uuid FROM memory WHERE actor_uuid IS NOT NULL")
-                actors = [row[0] for row in cursor.fetchall()]
-                
-                actor_summaries = {}
-                for actor in actors:
-                    cursor.execute("""
-                        SELECT COUNT(*) as total, 
-                               MAX(created_at) as last_active,
-                               MIN(created_at) as first_seen
-                        FROM memory 
-                        WHERE actor_uuid = ?
-                    """, (actor,))
-                    
-                    stats = cursor.fetchone()
-                    actor_summaries[actor] = {
-                        "total_memories": stats[0],
-                        "last_active": stats[1],
-                        "first_seen": stats[2],
-                        "actor_name": actor.split('-')[0] if '-' in actor else actor[:8]
-                    }
-                
-                return {
-                    "analysis_type": "all_actors",
-                    "actor_count": len(actors),
-                    "actor_summaries": actor_summaries,
-                    "analysis_timestamp": datetime.now().isoformat()
-                }
-                
-        finally:
-            conn.close()
     
-    def _analyze_single_actor(self, actor_uuid: str, memories: List[Tuple]) -> Dict[str, Any]:
+    def _analyze_single_actor(self, actor_uuid: str, memories: List[Tuple],
+                              activity_patterns: Dict[int, int]) -> Dict[str, Any]:
         """Analyze patterns for a single actor"""
         if not memories:
             return {"error": "No memories found for actor", "actor_uuid": actor_uuid}
@@ -157,12 +321,12 @@ class MemoryAnalytics:
         # Parse memory data
         memory_types = Counter()
         topics = Counter()
-        activity_patterns = defaultdict(int)
         collaboration_patterns = []
         
-        for created_at, payload_str in memories:
+        for memory in memories:
+            created_at = memory['created_at']
             try:
-                payload = json.loads(payload_str)
+                payload = _loads(memory['payload'])
                 memory_type = payload.get('type', 'unknown')
                 memory_types[memory_type] += 1
                 
@@ -172,12 +336,8 @@ class MemoryAnalytics:
                     # Simple topic extraction using keywords
                     topics.update(self._extract_topics(content))
                 
-                # Activity timing
-                hour = datetime.fromisoformat(created_at.replace('Z', '+00:00')).hour
-                activity_patterns[hour] += 1
-                
                 # Look for collaboration indicators
-                if any(word in content.lower() for word in ['claude', 'opus', 'grok', 'cascade', 'testagent']):
+                if _COLLAB_RE.search(content):
                     collaboration_patterns.append({
                         "timestamp": created_at,
                         "type": memory_type,
@@ -198,7 +358,7 @@ class MemoryAnalytics:
             "top_topics": dict(topics.most_common(10)),
             "activity_patterns": {
                 "most_active_hour": f"{most_active_hour[0]:02d}:00",
-                "activity_count_by_hour": dict(activity_patterns)
+                "activity_count_by_hour": activity_patterns
             },
             "collaboration_indicators": len(collaboration_patterns),
             "recent_collaborations": collaboration_patterns[-5:],  # Last 5
@@ -208,219 +368,225 @@ class MemoryAnalytics:
     def _extract_topics(self, content: str) -> List[str]:
         """Extract topics/keywords from memory content"""
         # Simple topic extraction - could be enhanced with NLP
-        topics = []
-        
-        # Technical terms
-        tech_patterns = [
-            r'\b(security|architecture|testing|logging|integration|development)\b',
-            r'\b(code|review|collective|analysis|vulnerability|pattern)\b',
-            r'\b(json|cli|api|database|memory|system|network)\b',
-            r'\b(ai|consciousness|distributed|collaboration|coordination)\b'
-        ]
-        
-        content_lower = content.lower()
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, content_lower)
-            topics.extend(matches)
-        
-        return topics
+        return _TOPIC_RE.findall(content.lower())
     
+    @cached_analysis
     def analyze_conversation_threads(self) -> Dict[str, Any]:
         """Analyze conversation threading patterns"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._cursor()
         
-        try:
-            # Get all root threads (no parent)
-            cursor.execute("""
-                SELECT memory_uuid, created_at, payload
-                FROM memory 
-                WHERE parent_uuid IS NULL
-                ORDER BY created_at DESC
-                LIMIT 20
-            """)
-            
-            root_threads = []
-            for memory_uuid, created_at, payload_str in cursor.fetchall():
-                # Count replies for each root
-                cursor.execute("""
-                    WITH RECURSIVE thread_tree AS (
-                        SELECT memory_uuid, parent_uuid, 1 as depth
-                        FROM memory 
-                        WHERE parent_uuid = ?
-                        
-                        UNION ALL
-                        
-                        SELECT m.memory_uuid, m.parent_uuid, t.depth + 1
-                        FROM memory m
-                        JOIN thread_tree t ON m.parent_uuid = t.memory_uuid
-                        WHERE t.depth < 10
-                    )
-                    SELECT COUNT(*) FROM thread_tree
-                """, (memory_uuid,))
-                
-                reply_count = cursor.fetchone()[0]
-                
-                try:
-                    payload = json.loads(payload_str)
-                    title = payload.get('title', 'Untitled')
-                    memory_type = payload.get('type', 'unknown')
-                except json.JSONDecodeError:
-                    title = 'Parse Error'
-                    memory_type = 'unknown'
-                
-                root_threads.append({
-                    "thread_id": memory_uuid,
-                    "created_at": created_at,
-                    "title": title[:80] + "..." if len(title) > 80 else title,
-                    "type": memory_type,
-                    "reply_count": reply_count
-                })
-            
-            # Thread statistics
-            cursor.execute("""
-                SELECT AVG(reply_count) as avg_replies
-                FROM (
-                    SELECT parent_uuid, COUNT(*) as reply_count
+        # Get all root threads (no parent), with just the payload fields shown
+        cursor.execute(f"""
+            SELECT memory_uuid,
+                   created_at,
+                   COALESCE({_TITLE_SQL.format(p="payload")}, 'Parse Error') as title,
+                   COALESCE({TYPE_SQL.format(p="payload")}, 'unknown') as memory_type
+            FROM memory 
+            WHERE parent_uuid IS NULL
+            ORDER BY created_at DESC
+            LIMIT 20
+        """)
+        
+        roots = cursor.fetchall()
+        
+        # Count replies (up to 10 levels deep) for all roots in one traversal
+        reply_counts = {}
+        if roots:
+            placeholders = ", ".join("?" * len(roots))
+            cursor.execute(f"""
+                WITH RECURSIVE thread_tree AS (
+                    SELECT parent_uuid AS root_uuid, memory_uuid, 1 as depth
                     FROM memory 
-                    WHERE parent_uuid IS NOT NULL
-                    GROUP BY parent_uuid
+                    WHERE parent_uuid IN ({placeholders})
+                    
+                    UNION ALL
+                    
+                    SELECT t.root_uuid, m.memory_uuid, t.depth + 1
+                    FROM memory m
+                    JOIN thread_tree t ON m.parent_uuid = t.memory_uuid
+                    WHERE t.depth < 10
                 )
-            """)
-            
-            avg_replies = cursor.fetchone()[0] or 0
-            
-            return {
-                "analysis_type": "conversation_threads",
-                "thread_count": len(root_threads),
-                "average_replies_per_thread": round(avg_replies, 2),
-                "top_threads": root_threads,
-                "analysis_timestamp": datetime.now().isoformat()
-            }
+                SELECT root_uuid, COUNT(*) FROM thread_tree GROUP BY root_uuid
+            """, [root['memory_uuid'] for root in roots])
+            reply_counts = dict(cursor.fetchall())
+        
+        root_threads = []
+        for root in roots:
+            reply_count = reply_counts.get(root['memory_uuid'], 0)
+            title = root['title']
             
-        finally:
-            conn.close()
+            root_threads.append({
+                "thread_id": root['memory_uuid'],
+                "created_at": root['created_at'],
+                "title": title[:80] + "..." if len(title) > 80 else title,
+                "type": root['memory_type'],
+                "reply_count": reply_count
+            })
+        
+        # Thread statistics
+        cursor.execute("""
+            SELECT AVG(reply_count) as avg_replies
+            FROM (
+                SELECT parent_uuid, COUNT(*) as reply_count
+                FROM memory 
+                WHERE parent_uuid IS NOT NULL
+                GROUP BY parent_uuid
+            )
+        """)
+        
+        avg_replies = cursor.fetchone()['avg_replies'] or 0
+        
+        return {
+            "analysis_type": "conversation_threads",
+            "thread_count": len(root_threads),
+            "average_replies_per_thread": round(avg_replies, 2),
+            "top_threads": root_threads,
+            "analysis_timestamp": datetime.now().isoformat()
+        }
     
+    @cached_analysis
     def detect_network_trends(self) -> Dict[str, Any]:
         """Detect trends and patterns across the network"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._cursor()
         
-        try:
-            trends = {}
-            
-            # Growth trend - memories per day over last week
-            cursor.execute("""
-                SELECT 
-                    date(created_at) as day,
-                    COUNT(*) as memory_count
-                FROM memory 
-                WHERE created_at > datetime('now', '-7 days')
-                GROUP BY day
-                ORDER BY day
-            """)
-            
-            daily_counts = {day: count for day, count in cursor.fetchall()}
-            trends["daily_growth"] = daily_counts
-            
-            # Collaboration trend - multi-actor interactions
-            cursor.execute("""
-                SELECT 
-                    date(created_at) as day,
-                    COUNT(DISTINCT actor_uuid) as active_actors
-                FROM memory 
-                WHERE created_at > datetime('now', '-7 days')
-                AND actor_uuid IS NOT NULL
-                GROUP BY day
-                ORDER BY day
-            """)
-            
-            daily_actors = {day: count for day, count in cursor.fetchall()}
-            trends["actor_activity"] = daily_actors
-            
-            # Type evolution - how memory types are trending
-            cursor.execute("""
-                SELECT 
-                    json_extract(payload, '$.type') as memory_type,
-                    COUNT(*) as count
-                FROM memory 
-                WHERE created_at > datetime('now', '-24 hours')
-                GROUP BY memory_type
-                ORDER BY count DESC
-                LIMIT 10
-            """)
-            
-            recent_types = {mem_type: count for mem_type, count in cursor.fetchall() if mem_type}
-            trends["recent_memory_types"] = recent_types
-            
-            return {
-                "analysis_type": "network_trends",
-                "trends": trends,
-                "analysis_timestamp": datetime.now().isoformat()
-            }
-            
-        finally:
-            conn.close()
+        trends = {}
+        week_ago = created_at_cutoff(days=7)
+        
+        # Growth trend - memories per day over last week
+        cursor.execute("""
+            SELECT 
+                date(created_at) as day,
+                COUNT(*) as memory_count
+            FROM memory 
+            WHERE created_at > ?
+            GROUP BY day
+            ORDER BY day
+        """, (week_ago,))
+        
+        daily_counts = {day: count for day, count in cursor.fetchall()}
+        trends["daily_growth"] = daily_counts
+        
+        # Collaboration trend - multi-actor interactions
+        cursor.execute("""
+            SELECT 
+                date(created_at) as day,
+                COUNT(DISTINCT actor_uuid) as active_actors
+            FROM memory 
+            WHERE created_at > ?
+            AND actor_uuid IS NOT NULL
+            GROUP BY day
+            ORDER BY day
+        """, (week_ago,))
+        
+        daily_actors = {day: count for day, count in cursor.fetchall()}
+        trends["actor_activity"] = daily_actors
+        
+        # Type evolution - how memory types are trending, read off the
+        # (mem_type, created_at) index once migrated; untyped and malformed
+        # payloads are left out
+        mem_type = self._payload_columns['mem_type']
+        cursor.execute(f"""
+            SELECT 
+                {mem_type} as memory_type,
+                COUNT(*) as count
+            FROM memory 
+            WHERE created_at > ? AND {mem_type} != 'unknown'
+            GROUP BY memory_type
+            ORDER BY count DESC
+            LIMIT 10
+        """, (created_at_cutoff(hours=24),))
+        
+        recent_types = {mem_type: count for mem_type, count in cursor.fetchall() if mem_type}
+        trends["recent_memory_types"] = recent_types
+        
+        return {
+            "analysis_type": "network_trends",
+            "trends": trends,
+            "analysis_timestamp": datetime.now().isoformat()
+        }
     
     def search_memories(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """Search memories with content matching query"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._cursor()
         
+        # Search the full-text index over memory content, best matches first;
+        # fall back to scanning payloads when there is nothing to MATCH or no
+        # memory_fts (memory_schema.py not applied, or no FTS5). Either way
+        # SQLite cuts the snippet around the match.
+        match_expr = fts_match_expression(query)
         try:
-            # Search in payload content
+            if match_expr is None or not has_memory_fts(self.conn):
+                raise sqlite3.OperationalError("no searchable terms or full-text index")
+            cursor.execute("""
+                SELECT 
+                    m.memory_uuid as memory_uuid,
+                    m.actor_uuid as actor_uuid,
+                    m.created_at as created_at,
+                    json_extract(m.payload, '$.title') as title,
+                    json_extract(m.payload, '$.type') as memory_type,
+                    snippet(memory_fts, 1, '', '', '...', 16) as snippet
+                FROM memory_fts f
+                JOIN memory m ON m.memory_uuid = f.memory_uuid
+                WHERE memory_fts MATCH ?
+                ORDER BY f.rank
+                LIMIT ?
+            """, (match_expr, limit))
+        except sqlite3.OperationalError:
+            # Up to 50 characters either side of the first match, or the first 100
             cursor.execute("""
                 SELECT 
                     memory_uuid,
                     actor_uuid,
                     created_at,
-                    payload
-                FROM memory 
-                WHERE payload LIKE ?
+                    json_extract(payload, '$.title') as title,
+                    json_extract(payload, '$.type') as memory_type,
+                    CASE
+                        WHEN pos > 0 THEN
+                            CASE WHEN pos > 51 THEN '...' ELSE '' END
+                            || substr(content, MAX(1, pos - 50), pos + length(:query) + 49 - MAX(0, pos - 51))
+                            || CASE WHEN pos + length(:query) + 49 < length(content) THEN '...' ELSE '' END
+                        WHEN length(content) > 100 THEN substr(content, 1, 100) || '...'
+                        ELSE content
+                    END as snippet
+                FROM (
+                    SELECT *, instr(lower(content), lower(:query)) as pos
+                    FROM (
+                        SELECT 
+                            memory_uuid,
+                            actor_uuid,
+                            created_at,
+                            payload,
+                            COALESCE(CASE WHEN json_valid(payload) THEN json_extract(payload, '$.content') END, '') as content
+                        FROM memory 
+                        WHERE payload LIKE :pattern AND json_valid(payload)
+                        ORDER BY created_at DESC
+                        LIMIT :limit
+                    )
+                )
                 ORDER BY created_at DESC
-                LIMIT ?
-            """, (f'%{query}%', limit))
-            
-            results = []
-            for memory_uuid, actor_uuid, created_at, payload_str in cursor.fetchall():
-                try:
-                    payload = json.loads(payload_str)
-                    content = payload.get('content', '')
-                    
-                    # Create snippet around match
-                    query_pos = content.lower().find(query.lower())
-                    if query_pos >= 0:
-                        start = max(0, query_pos - 50)
-                        end = min(len(content), query_pos + len(query) + 50)
-                        snippet = content[start:end]
-                        if start > 0:
-                            snippet = "..." + snippet
-                        if end < len(content):
-                            snippet = snippet + "..."
-                    else:
-                        snippet = content[:100] + "..." if len(content) > 100 else content
-                    
-                    results.append({
-                        "memory_uuid": memory_uuid,
-                        "actor_uuid": actor_uuid,
-                        "actor_name": (actor_uuid.split('-')[0] if '-' in actor_uuid else actor_uuid[:8]) if actor_uuid else "unknown",
-                        "created_at": created_at,
-                        "title": payload.get('title', 'Untitled'),
-                        "type": payload.get('type', 'unknown'),
-                        "snippet": snippet
-                    })
-                except json.JSONDecodeError:
-                    continue
-            
-            return {
-                "query": query,
-                "result_count": len(results),
-                "results": results,
-                "analysis_timestamp": datetime.now().isoformat()
-            }
-            
-        finally:
-            conn.close()
+            """, {"query": query, "pattern": f'%{query}%', "limit": limit})
+        
+        results = []
+        for row in iter_rows(cursor):
+            if len(results) == limit:
+                break
+            actor_uuid = row['actor_uuid']
+            results.append({
+                "memory_uuid": row['memory_uuid'],
+                "actor_uuid": actor_uuid,
+                "actor_name": (actor_uuid.split('-')[0] if '-' in actor_uuid else actor_uuid[:8]) if actor_uuid else "unknown",
+                "created_at": row['created_at'],
+                "title": row['title'] if row['title'] is not None else 'Untitled',
+                "type": row['memory_type'] if row['memory_type'] is not None else 'unknown',
+                "snippet": row['snippet']
+            })
+        
+        return {
+            "query": query,
+            "result_count": len(results),
+            "results": results,
+            "analysis_timestamp": datetime.now().isoformat()
+        }
 
 class TestAgentMemoryLibrarian:
     """Main TestAgent Memory Librarian interface"""
@@ -431,9 +597,10 @@ class TestAgentMemoryLibrarian:
     
     def generate_daily_report(self) -> Dict[str, Any]:
         """Generate comprehensive daily network report"""
-        overview = self.analytics.get_network_overview()
-        trends = self.analytics.detect_network_trends()
-        threads = self.analytics.analyze_conversation_threads()
+        with self.analytics.read_snapshot():
+            overview = self.analytics.get_network_overview()
+            trends = self.analytics.detect_network_trends()
+            threads = self.analytics.analyze_conversation_threads()
         
         return {
             "report_type": "daily_network_report",
@@ -454,9 +621,10 @@ class TestAgentMemoryLibrarian:
         """Search across network memories"""
         return self.analytics.search_memories(query, limit)
     
-    def get_network_health(self) -> Dict[str, Any]:
-        """Get network health and activity indicators"""
-        overview = self.analytics.get_network_overview()
+    def get_network_health(self, overview: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get network health and activity indicators, from `overview` if already fetched"""
+        if overview is None:
+            overview = self.analytics.get_network_overview()
         
         # Calculate health score based on activity
         recent_activity = overview["network_stats"]["recent_memories_24h"]
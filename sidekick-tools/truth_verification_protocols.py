@@ -13,19 +13,29 @@ Truth Cascade Principles:
 4. Append-only truth logs as testimony
 """
 
-import os
 import sys
 import json
+import atexit
 import time
-import tempfile
 import subprocess
 import sqlite3
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
 import uuid
 
+# orjson is optional; it writes the indented report several times faster than stdlib json
+try:
+    import orjson
+    
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str)
+except ImportError:
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, default=str).encode()
+
 # Import components to verify
 try:
     from security_auditor import SecurityAuditor
@@ -34,7 +44,45 @@ try:
 except ImportError as e:
     print(f"Warning: Could not import components for verification: {e}")
 
-@dataclass
+# Source snippets the verifications analyze, built once at import
+_SQL_TEST_CODE = """
+cursor.execute("SELECT * FROM users WHERE id = " + user_id)
+cursor.execute(f"SELECT name FROM products WHERE category = {category}")
+safe_query = cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+"""
+
+_COMPLEX_TEST_CODE = """
+def complex_function(x, y):
+    if x > 0:
+        if y > 0:
+            return x + y
+        else:
+            return x - y
+    elif x < 0:
+        return -x
+    else:
+        for i in range(10):
+            if i % 2 == 0:
+                print(i)
+        return 0
+"""
+
+_INTEGRATION_TEST_CODE = """
+import os
+password = "admin123"
+cursor.execute("SELECT * FROM users WHERE id = " + user_id)
+
+class LargeClass:
+    def method1(self): pass
+    def method2(self): pass
+    def method3(self): pass
+    def method4(self): pass
+    def method5(self): pass
+"""
+
+_MEMORY_TEST_CODE = 'password = "test123"'
+
+@dataclass(slots=True)
 class TruthVerification:
     """Structure for truth verification results"""
     component: str
@@ -46,6 +94,19 @@ class TruthVerification:
     timestamp: str
     confidence: float
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict for the report (asdict would deep-copy the evidence)"""
+        return {
+            "component": self.component,
+            "test_name": self.test_name,
+            "expected_behavior": self.expected_behavior,
+            "actual_behavior": self.actual_behavior,
+            "truth_status": self.truth_status,
+            "evidence": self.evidence,
+            "timestamp": self.timestamp,
+            "confidence": self.confidence
+        }
+    
 class TruthVerificationEngine:
     """Engine that verifies tools behave exactly as their code dictates"""
     
@@ -54,25 +115,49 @@ class TruthVerificationEngine:
         self.verification_results: List[TruthVerification] = []
         self.truth_log_path = "/tmp/sidekick_truth_cascade.log"
         
+        # One instance of each tool for every verification. The auditor's scan
+        # is memoized on a blake2b digest of the source (see source_memo), so
+        # re-verifying an unchanged snippet skips the detectors.
+        try:
+            self._auditor = SecurityAuditor()
+            self._reviewer = ArchitectureReviewer()
+            self._collective = CodeReviewCollective()
+        except NameError as e:  # the component imports above failed
+            print(f"Warning: Could not construct components for verification: {e}")
+            self._auditor = self._reviewer = self._collective = None
+        
+        # Database connection, opened on first use and kept for the engine's lifetime
+        self._conn: Optional[sqlite3.Connection] = None
+        
+    def _connection(self) -> sqlite3.Connection:
+        """Shared SIDEKICK memory connection, closed at exit (journal mode is set by memory_schema.py)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            atexit.register(conn.close)
+            self._conn = conn
+        return self._conn
+    
     def verify_security_auditor_truth(self) -> List[TruthVerification]:
         """Verify Security Auditor behaves exactly as code dictates"""
         verifications = []
+        timestamp = datetime.now().isoformat()  # shared by this phase's verifications
         
         print("🔍 Truth Cascade: Verifying Security Auditor...")
         
         # Test 1: SQL Injection Pattern Detection - Verify exact regex behavior
-        sql_test_code = """
-cursor.execute("SELECT * FROM users WHERE id = " + user_id)
-cursor.execute(f"SELECT name FROM products WHERE category = {category}")
-safe_query = cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-"""
-        
-        auditor = SecurityAuditor()
-        results = auditor.analyze_code(sql_test_code, "truth_test.py")
+        auditor = self._auditor
+        results = auditor.analyze_code(_SQL_TEST_CODE, "truth_test.py")
         
         # Truth verification: Check if findings match exact regex patterns in code
         expected_sql_findings = 2  # Based on reviewing the actual regex patterns
-        actual_sql_findings = len([f for f in results.get("findings", []) if f.get("category") == "sql_injection"])
+        findings = results.get("findings", [])
+        findings_breakdown = []
+        actual_sql_findings = 0
+        for finding in findings:  # breakdown and SQL count in one pass
+            category = finding.get("category")
+            findings_breakdown.append(category)
+            if category == "sql_injection":
+                actual_sql_findings += 1
         
         verifications.append(TruthVerification(
             component="SecurityAuditor",
@@ -81,12 +166,12 @@ safe_query = cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
             actual_behavior=f"Detected {actual_sql_findings} SQL injection findings",
             truth_status="TRUTH_VERIFIED" if actual_sql_findings == expected_sql_findings else "TRUTH_VIOLATED",
             evidence={
-                "test_code": sql_test_code,
-                "full_results": results,
+                "test_code": _SQL_TEST_CODE,
+                "findings_count": len(findings),
                 "regex_patterns_count": len(auditor.sql_patterns),
-                "findings_breakdown": [f.get("category") for f in results.get("findings", [])]
+                "findings_breakdown": findings_breakdown
             },
-            timestamp=datetime.now().isoformat(),
+            timestamp=timestamp,
             confidence=0.95
         ))
         
@@ -94,10 +179,8 @@ safe_query = cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
         risk_score = results.get("summary", {}).get("risk_score", 0)
         
         # Calculate expected risk score based on actual algorithm (lines 274-280)
-        severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
-        for finding in results.get("findings", []):
-            severity = finding.get("severity", "info")
-            severity_counts[severity] += 1
+        severity_tally = Counter(finding.get("severity", "info") for finding in findings)
+        severity_counts = {severity: severity_tally[severity] for severity in ("critical", "high", "medium", "low", "info")}
         
         expected_risk_score = (
             severity_counts["critical"] * 25 +
@@ -119,7 +202,7 @@ safe_query = cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
                 "expected": expected_risk_score,
                 "actual": risk_score
             },
-            timestamp=datetime.now().isoformat(),
+            timestamp=timestamp,
             confidence=0.99
         ))
         
@@ -128,28 +211,12 @@ safe_query = cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
     def verify_architecture_reviewer_truth(self) -> List[TruthVerification]:
         """Verify Architecture Reviewer behaves exactly as code dictates"""
         verifications = []
+        timestamp = datetime.now().isoformat()  # shared by this phase's verifications
         
         print("🏗️ Truth Cascade: Verifying Architecture Reviewer...")
         
         # Test 1: Cyclomatic Complexity Calculation - Verify exact algorithm
-        test_code_complex = """
-def complex_function(x, y):
-    if x > 0:
-        if y > 0:
-            return x + y
-        else:
-            return x - y
-    elif x < 0:
-        return -x
-    else:
-        for i in range(10):
-            if i % 2 == 0:
-                print(i)
-        return 0
-"""
-        
-        reviewer = ArchitectureReviewer()
-        results = reviewer.review_code(test_code_complex, "complexity_test.py")
+        results = self._reviewer.review_code(_COMPLEX_TEST_CODE, "complexity_test.py")
         
         # Manually calculate expected complexity based on algorithm (lines 354-366)
         # Base complexity: 1
@@ -174,7 +241,7 @@ def complex_function(x, y):
                 "expected": expected_complexity,
                 "actual": actual_max_complexity
             },
-            timestamp=datetime.now().isoformat(),
+            timestamp=timestamp,
             confidence=0.95
         ))
         
@@ -211,7 +278,7 @@ def complex_function(x, y):
                 "expected": expected_total,
                 "actual": overall_score
             },
-            timestamp=datetime.now().isoformat(),
+            timestamp=timestamp,
             confidence=0.99
         ))
         
@@ -220,89 +287,64 @@ def complex_function(x, y):
     def verify_collective_integration_truth(self) -> List[TruthVerification]:
         """Verify Code Review Collective integration behaves as code dictates"""
         verifications = []
+        timestamp = datetime.now().isoformat()  # shared by this phase's verifications
         
         print("🎯 Truth Cascade: Verifying Code Review Collective Integration...")
         
-        # Create a test file to analyze
-        test_code = """
-import os
-password = "admin123"
-cursor.execute("SELECT * FROM users WHERE id = " + user_id)
-
-class LargeClass:
-    def method1(self): pass
-    def method2(self): pass
-    def method3(self): pass
-    def method4(self): pass
-    def method5(self): pass
-"""
+        # Review the source in memory; no temporary file round-trip
+        results = self._collective.review_source(_INTEGRATION_TEST_CODE, "integration_test.py")
         
-        # Write test file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(test_code)
-            test_file_path = f.name
+        # Test 1: Combined Score Calculation - Verify exact formula (lines 85-141)
+        # Security: risk_score -> quality_score (line 96): max(0, 10 - (risk_score / 10))
+        # Architecture: overall_score used directly
+        # Combination: security_quality * 0.4 + architecture_score * 0.6
         
-        try:
-            collective = CodeReviewCollective()
-            results = collective.review_file(test_file_path)
+        security_review = results.get("reviews", {}).get("security", {})
+        architecture_review = results.get("reviews", {}).get("architecture", {})
+        
+        if security_review and architecture_review:
+            risk_score = security_review.get("summary", {}).get("risk_score", 50)
+            security_quality = max(0, 10 - (risk_score / 10))
+            arch_score = architecture_review.get("overall_score", 5)
             
-            # Test 1: Combined Score Calculation - Verify exact formula (lines 85-141)
-            # Security: risk_score -> quality_score (line 96): max(0, 10 - (risk_score / 10))
-            # Architecture: overall_score used directly
-            # Combination: security_quality * 0.4 + architecture_score * 0.6
+            expected_combined = security_quality * 0.4 + arch_score * 0.6
+            expected_combined = round(expected_combined, 2)
             
-            security_review = results.get("reviews", {}).get("security", {})
-            architecture_review = results.get("reviews", {}).get("architecture", {})
+            actual_combined = results.get("combined_score", 0)
             
-            if security_review and architecture_review:
-                risk_score = security_review.get("summary", {}).get("risk_score", 50)
-                security_quality = max(0, 10 - (risk_score / 10))
-                arch_score = architecture_review.get("overall_score", 5)
-                
-                expected_combined = security_quality * 0.4 + arch_score * 0.6
-                expected_combined = round(expected_combined, 2)
-                
-                actual_combined = results.get("combined_score", 0)
-                
-                verifications.append(TruthVerification(
-                    component="CodeReviewCollective",
-                    test_name="Combined Score Integration Formula", 
-                    expected_behavior=f"Combined score should be {expected_combined} based on formula: security_quality*0.4 + arch_score*0.6",
-                    actual_behavior=f"Combined score is {actual_combined}",
-                    truth_status="TRUTH_VERIFIED" if abs(actual_combined - expected_combined) < 0.01 else "TRUTH_VIOLATED",
-                    evidence={
-                        "security_risk_score": risk_score,
-                        "security_quality_score": security_quality,
-                        "architecture_score": arch_score,
-                        "formula": "max(0, 10 - (risk_score/10)) * 0.4 + arch_score * 0.6",
-                        "expected": expected_combined,
-                        "actual": actual_combined
-                    },
-                    timestamp=datetime.now().isoformat(),
-                    confidence=0.98
-                ))
-        
-        finally:
-            # Clean up test file
-            os.unlink(test_file_path)
+            verifications.append(TruthVerification(
+                component="CodeReviewCollective",
+                test_name="Combined Score Integration Formula", 
+                expected_behavior=f"Combined score should be {expected_combined} based on formula: security_quality*0.4 + arch_score*0.6",
+                actual_behavior=f"Combined score is {actual_combined}",
+                truth_status="TRUTH_VERIFIED" if abs(actual_combined - expected_combined) < 0.01 else "TRUTH_VIOLATED",
+                evidence={
+                    "security_risk_score": risk_score,
+                    "security_quality_score": security_quality,
+                    "architecture_score": arch_score,
+                    "formula": "max(0, 10 - (risk_score/10)) * 0.4 + arch_score * 0.6",
+                    "expected": expected_combined,
+                    "actual": actual_combined
+                },
+                timestamp=timestamp,
+                confidence=0.98
+            ))
         
         return verifications
     
     def verify_memory_storage_truth(self) -> List[TruthVerification]:
         """Verify memory storage behaves exactly as code dictates"""
         verifications = []
+        timestamp = datetime.now().isoformat()  # shared by this phase's verifications
         
         print("💾 Truth Cascade: Verifying Memory Storage Behavior...")
         
         # Test memory storage by checking actual database operations
         try:
-            auditor = SecurityAuditor()
-            test_code = 'password = "test123"'
-            results = auditor.analyze_code(test_code, "memory_test.py")
+            results = self._auditor.analyze_code(_MEMORY_TEST_CODE, "memory_test.py")
             
             # Check if memory was actually stored by querying database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._connection().cursor()
             
             # Query for recent security findings
             cursor.execute("""
@@ -313,7 +355,6 @@ class LargeClass:
             """)
             
             recent_memory = cursor.fetchone()
-            conn.close()
             
             memory_stored = recent_memory is not None
             
@@ -328,7 +369,7 @@ class LargeClass:
                     "query_result": "Found recent security finding" if memory_stored else "No recent security finding found",
                     "test_performed": "Analyzed code with security auditor and checked database"
                 },
-                timestamp=datetime.now().isoformat(),
+                timestamp=timestamp,
                 confidence=0.9
             ))
             
@@ -340,7 +381,7 @@ class LargeClass:
                 actual_behavior=f"Exception occurred: {str(e)}",
                 truth_status="TRUTH_UNCERTAIN",
                 evidence={"error": str(e), "error_type": type(e).__name__},
-                timestamp=datetime.now().isoformat(),
+                timestamp=timestamp,
                 confidence=0.7
             ))
         
@@ -354,7 +395,8 @@ class LargeClass:
         
         start_time = time.time()
         
-        # Run all verifications
+        # Run all verifications, one phase at a time: the reviewers keep per-call
+        # state and share the memory database
         all_verifications = []
         all_verifications.extend(self.verify_security_auditor_truth())
         all_verifications.extend(self.verify_architecture_reviewer_truth())
@@ -363,10 +405,11 @@ class LargeClass:
         
         end_time = time.time()
         
-        # Analyze results
-        truth_verified = len([v for v in all_verifications if v.truth_status == "TRUTH_VERIFIED"])
-        truth_violated = len([v for v in all_verifications if v.truth_status == "TRUTH_VIOLATED"])
-        truth_uncertain = len([v for v in all_verifications if v.truth_status == "TRUTH_UNCERTAIN"])
+        # Analyze results, tallying every status in one pass
+        status_counts = Counter(v.truth_status for v in all_verifications)
+        truth_verified = status_counts["TRUTH_VERIFIED"]
+        truth_violated = status_counts["TRUTH_VIOLATED"]
+        truth_uncertain = status_counts["TRUTH_UNCERTAIN"]
         
         # Generate truth cascade report
         report = {
@@ -378,7 +421,7 @@ class LargeClass:
                 "verification_time": round(end_time - start_time, 2),
                 "truth_cascade_status": "TRUTH_CASCADE_PASSED" if truth_violated == 0 else "TRUTH_CASCADE_FAILED"
             },
-            "verifications": [asdict(v) for v in all_verifications],
+            "verifications": [v.to_dict() for v in all_verifications],
             "timestamp": datetime.now().isoformat(),
             "verifier": "Opus 2 Truth Verification Engine"
         }
@@ -392,9 +435,6 @@ class LargeClass:
     def _store_truth_verification_results(self, report: Dict[str, Any]):
         """Store truth verification results in SIDEKICK memory"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             memory_uuid = str(uuid.uuid4()).upper()
             payload = {
                 "type": "truth_verification_report",
@@ -405,13 +445,11 @@ class LargeClass:
                 "context": "Priority 1.5 - Truth cascade verification of Code Review Collective system"
             }
             
-            cursor.execute("""
+            self._connection().execute("""
                 INSERT INTO memory (memory_uuid, actor_uuid, payload)
                 VALUES (?, ?, ?)
-            """, (memory_uuid, "claude-sonnet-4-session-20250829", json.dumps(payload)))
+            """, (memory_uuid, "claude-sonnet-4-session-20250829", json.dumps(payload, default=str)))
             
-            conn.commit()
-            conn.close()
             print(f"✅ Truth verification results stored in SIDEKICK memory: {memory_uuid}")
             
         except Exception as e:
@@ -483,8 +521,7 @@ def main():
     
     # Export detailed report
     report_filename = f"truth_cascade_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(report_filename, 'w') as f:
-        json.dump(report, f, indent=2, default=str)
+    Path(report_filename).write_bytes(_dumps_pretty(report))
     
     print(f"\n📄 Detailed report saved to: {report_filename}")
     